@@ -77,10 +77,10 @@ class FilmScannerApp:
         self.frame_update_timer = self.ui_manager.schedule_task(16, self.check_live_view_updates)
         
         # Start health monitoring
-        self.health_check_timer = self.ui_manager.schedule_task(1000, self.update_health_status)
+        self.health_check_timer = self.ui_manager.schedule_periodic(1000, self.update_health_status)
         
         # Start camera settings updates
-        self.camera_settings_timer = self.ui_manager.schedule_task(200, self.update_camera_settings)
+        self.camera_settings_timer = self.ui_manager.schedule_periodic(200, self.update_camera_settings)
         
         # Load settings
         self._apply_settings()
@@ -140,9 +140,9 @@ class FilmScannerApp:
         if show_fps != self.ui_manager.show_fps:
             self.ui_manager.show_fps = show_fps
             if show_fps:
-                self.ui_manager.fps_label.pack(side=tk.LEFT)
+                self.ui_manager.fps_label.grid()
             else:
-                self.ui_manager.fps_label.pack_forget()
+                self.ui_manager.fps_label.grid_remove()
     
     def on_window_close(self):
         """Handle window close event."""
@@ -155,9 +155,9 @@ class FilmScannerApp:
             if self.frame_update_timer:
                 self.ui_manager.cancel_task(self.frame_update_timer)
             if self.health_check_timer:
-                self.ui_manager.cancel_task(self.health_check_timer)
+                self.ui_manager.cancel_periodic(self.health_check_timer)
             if self.camera_settings_timer:
-                self.ui_manager.cancel_task(self.camera_settings_timer)
+                self.ui_manager.cancel_periodic(self.camera_settings_timer)
             
             # Stop camera
             self.camera_controller.stop_live_view()
@@ -250,9 +250,6 @@ class FilmScannerApp:
             
             # Update UI with health status
             self.ui_manager.update_health_status(message, status)
-        
-        # Schedule next update
-        self.health_check_timer = self.ui_manager.schedule_task(1000, self.update_health_status)
     
     def update_camera_settings(self):
         """Update camera status display with current settings."""
@@ -271,9 +268,6 @@ class FilmScannerApp:
                 )
         except Exception as e:
             print(f"Error updating camera settings: {e}")
-        
-        # Schedule next update
-        self.camera_settings_timer = self.ui_manager.schedule_task(200, self.update_camera_settings)
     
     def take_photo(self):
         """Initiate photo capture process."""
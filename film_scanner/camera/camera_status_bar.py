@@ -69,7 +69,7 @@ class CameraStatusBar:
         self.photo_image = None
         
         # Initial render
-        self.update()
+        self._redraw()
 
     def _find_monospace_font(self):
         """Try to find a suitable monospace font on the system"""
@@ -96,7 +96,7 @@ class CameraStatusBar:
         """Handle resizing of the canvas"""
         self.canvas_width = event.width
         self.canvas_height = event.height
-        self.update()
+        self._redraw()
         
     def update(self, aperture=None, shutter_speed=None, iso=None, 
                exposure_warning=None, focus_status=None):
@@ -110,18 +110,27 @@ class CameraStatusBar:
             exposure_warning: Exposure warning indicator (e.g., "+2.0")
             focus_status: Focus status indicator (e.g., "●" for focused)
         """
+        values = {
+            "aperture": aperture,
+            "shutter_speed": shutter_speed,
+            "iso": iso,
+            "exposure_warning": exposure_warning,
+            "focus_status": focus_status
+        }
+        
+        # Only redraw when a provided value differs from what is shown
+        changed = {k: v for k, v in values.items() if v is not None and getattr(self, k) != v}
+        if not changed:
+            return
+        
         # Update values if provided
-        if aperture is not None:
-            self.aperture = aperture
-        if shutter_speed is not None:
-            self.shutter_speed = shutter_speed
-        if iso is not None:
-            self.iso = iso
-        if exposure_warning is not None:
-            self.exposure_warning = exposure_warning
-        if focus_status is not None:
-            self.focus_status = focus_status
-            
+        for name, value in changed.items():
+            setattr(self, name, value)
+        
+        self._redraw()
+    
+    def _redraw(self):
+        """Render the current values into the status bar"""
         # Skip if canvas not sized yet
         if not hasattr(self, 'canvas_width') or self.canvas_width == 0:
             return
@@ -0,0 +1,97 @@
+import pytest
+
+from film_scanner.util import performance_monitor
+from film_scanner.util.performance_monitor import PerformanceMonitor
+
+
+class FakeClock:
+    """Deterministic replacement for time.time"""
+    def __init__(self, start=1000.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fixture to drive the monitor with a controllable clock"""
+    fake = FakeClock()
+    monkeypatch.setattr(performance_monitor.time, "time", fake)
+    return fake
+
+
+class TestPerformanceMonitor:
+    def test_counts_only_frames_in_window(self, clock):
+        """Test that frames older than the window are not counted"""
+        monitor = PerformanceMonitor(window_size=2)
+        for _ in range(10):
+            clock.advance(0.1)
+            monitor.record_frame()
+        clock.advance(1.55)
+
+        _, fps, _, _ = monitor.get_health_status()
+        assert fps == pytest.approx(5 / 2)
+
+    def test_max_gap_expires_with_window(self, clock):
+        """Test that the max gap drops once its frames leave the window"""
+        monitor = PerformanceMonitor(window_size=2)
+        monitor.record_frame()
+        clock.advance(0.8)
+        monitor.record_frame()
+        for _ in range(5):
+            clock.advance(0.1)
+            monitor.record_frame()
+
+        assert monitor.get_health_status()[3] == pytest.approx(0.8)
+
+        clock.advance(1.5)
+        assert monitor.get_health_status()[3] == pytest.approx(0.1)
+
+    def test_error_rate(self, clock):
+        """Test error rate over frames in the window"""
+        monitor = PerformanceMonitor(window_size=10)
+        for i in range(10):
+            clock.advance(0.1)
+            monitor.record_frame(had_error=(i % 5 == 0))
+
+        assert monitor.get_health_status()[2] == pytest.approx(0.2)
+
+    def test_fps_average_over_recent_seconds(self, clock):
+        """Test that get_fps averages the last ten per-second samples"""
+        monitor = PerformanceMonitor()
+        for second in range(12):
+            rate = 10 if second < 2 else 20
+            for _ in range(rate):
+                clock.advance(1.0 / rate)
+                monitor.record_frame()
+
+        assert len(monitor.fps_values) == 10
+        assert monitor.get_fps() == pytest.approx(sum(monitor.fps_values) / 10)
+
+    def test_processing_time_stats_follow_window(self, clock):
+        """Test min/max/avg over the last 50 processing times"""
+        monitor = PerformanceMonitor()
+        samples = [0.5] + [0.01 * (i % 7 + 1) for i in range(60)]
+        for sample in samples:
+            clock.advance(0.05)
+            monitor.record_frame(processing_time=sample)
+
+        recent = samples[-50:]
+        stats = monitor.get_processing_time_stats()
+        assert stats["min"] == min(recent)
+        assert stats["max"] == max(recent)
+        assert stats["avg"] == pytest.approx(sum(recent) / 50)
+
+    def test_reset(self, clock):
+        """Test that reset clears all window state"""
+        monitor = PerformanceMonitor()
+        for _ in range(3):
+            clock.advance(0.5)
+            monitor.record_frame(had_error=True)
+        monitor.reset()
+
+        assert monitor.get_health_status()[1:] == (0, 0, 0)
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from film_scanner.util.settings_manager import SettingsManager
+
+
+class TestSettingsManager:
+    @pytest.fixture
+    def config_file(self, tmp_path):
+        """Fixture to provide a settings file path in a temp directory"""
+        return str(tmp_path / "settings.json")
+
+    def test_nested_get_and_set(self, config_file):
+        """Test dot-notation access to nested settings"""
+        settings = SettingsManager(config_file)
+        assert settings.get("ui.show_camera_status") is True
+
+        settings.set("ui.show_camera_status", False)
+        settings.set("a.b.c", 3)
+
+        assert settings.get("ui.show_camera_status") is False
+        assert settings.get("a.b") == {"c": 3}
+        assert settings.get("a.b.c") == 3
+        assert settings.get("a.missing", "default") == "default"
+
+    def test_replacing_subtree_updates_nested_keys(self, config_file):
+        """Test that setting a whole dict replaces its dot-notation keys"""
+        settings = SettingsManager(config_file)
+        settings.set("ui", {"status_bar_color": "#000000"})
+
+        assert settings.get("ui.status_bar_color") == "#000000"
+        assert settings.get("ui.show_camera_status") is None
+
+    def test_reset_restores_defaults(self, config_file):
+        """Test that nested changes don't leak into the class defaults"""
+        settings = SettingsManager(config_file)
+        settings.set("ui.camera_status_height", 99)
+        settings.reset_to_defaults()
+
+        assert settings.get("ui.camera_status_height") == 30
+        assert SettingsManager.DEFAULT_SETTINGS["ui"]["camera_status_height"] == 30
+
+    def test_save_round_trip(self, config_file):
+        """Test that saved settings are loaded back"""
+        settings = SettingsManager(config_file)
+        settings.set("quality_index", 3)
+        assert settings.save_settings()
+
+        with open(config_file) as f:
+            assert json.load(f)["quality_index"] == 3
+        assert SettingsManager(config_file).get("quality_index") == 3
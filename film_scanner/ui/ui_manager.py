@@ -4,9 +4,10 @@ Handles all UI-related concerns including window creation,
 layout management, and UI updates.
 """
 import tkinter as tk
-from tkinter import messagebox
-from typing import Optional, Callable, Dict, Tuple
+from typing import Optional, Callable, Dict, Tuple, Any
 import os
+import queue
+import threading
 
 from ..control.state_manager import StateManager, AppState, StateChangeEvent
 from ..camera.camera_status_bar import CameraStatusBar
@@ -58,12 +59,26 @@ class UIManager:
         self.last_window_size = (0, 0)
         self.resize_timer = None
         self.show_fps = True
+        self._flush_scheduled = False
+        self._ui_chrome_h = None  # Height of bars around the image, computed lazily
+        
+        # Screen dimensions, refreshed only if the window moves off this screen
+        self._screen_w = self.root.winfo_screenwidth()
+        self._screen_h = self.root.winfo_screenheight()
+        self.root.bind("<Configure>", self._on_root_configure, add="+")
+        
+        # State changes published from camera/download threads are queued
+        # here and applied on the Tk thread
+        self._ui_queue = queue.Queue()
         
         # Subscribe to state changes
         self.state_manager.subscribe(self._handle_state_change)
         
         # Create UI components
         self._create_ui_components()
+        
+        # Apply queued state changes on the Tk thread
+        self._ui_queue_timer = self.schedule_periodic(16, self._drain_ui_queue)
     
     def _create_ui_components(self):
         """Create all UI components and layout."""
@@ -86,18 +101,20 @@ class UIManager:
         self.info_frame = tk.Frame(self.root, height=50)
         self.info_frame.pack(side=tk.BOTTOM, fill=tk.X)
         
+        # Fixed grid cells so a text change in one label doesn't re-flow the others
         self.info_label = tk.Label(self.info_frame, text="Initializing...", anchor=tk.W, padx=10)
-        self.info_label.pack(side=tk.LEFT)
+        self.info_label.grid(row=0, column=0, sticky=tk.W)
         
         self.quality_label = tk.Label(self.info_frame, text="", anchor=tk.W, padx=10)
-        self.quality_label.pack(side=tk.LEFT)
+        self.quality_label.grid(row=0, column=1, sticky=tk.W)
         
         self.fps_label = tk.Label(self.info_frame, text="0 FPS", anchor=tk.W, padx=10)
-        if self.show_fps:
-            self.fps_label.pack(side=tk.LEFT)
+        self.fps_label.grid(row=0, column=2, sticky=tk.W)
+        if not self.show_fps:
+            self.fps_label.grid_remove()
         
         self.health_label = tk.Label(self.info_frame, text="", fg="red", anchor=tk.W, padx=10)
-        self.health_label.pack(side=tk.LEFT)
+        self.health_label.grid(row=0, column=3, sticky=tk.W)
         
         shortcut_text = "S: Shoot | F: Focus Peaking | P: Quality | I: Invert | ESC: Quit | ?: Help"
         self.shortcut_label = tk.Label(
@@ -106,7 +123,26 @@ class UIManager:
             anchor=tk.E, 
             padx=10
         )
-        self.shortcut_label.pack(side=tk.RIGHT)
+        self.shortcut_label.grid(row=0, column=4, sticky=tk.E)
+        self.info_frame.grid_columnconfigure(4, weight=1)
+    
+    def _on_root_configure(self, event):
+        """
+        Refresh the cached screen size when the window lands on another screen.
+        
+        Uses the geometry carried by the event, so ordinary moves and
+        resizes don't query Tk.
+        
+        Args:
+            event: Tk <Configure> event
+        """
+        if event.widget is not self.root:
+            return
+        center_x = event.x + event.width // 2
+        center_y = event.y + event.height // 2
+        if not (0 <= center_x < self._screen_w and 0 <= center_y < self._screen_h):
+            self._screen_w = self.root.winfo_screenwidth()
+            self._screen_h = self.root.winfo_screenheight()
     
     def _handle_window_close(self):
         """Handle window close event."""
@@ -117,6 +153,38 @@ class UIManager:
         """
         Handle application state changes.
         
+        Worker threads must not call into Tk, so transitions published from
+        camera/download threads are only queued. Transitions on the Tk thread
+        are applied immediately, after any still queued, so they stay ordered
+        with direct update_status calls.
+        
+        Args:
+            event: State change event data
+        """
+        if threading.current_thread() is threading.main_thread():
+            self._drain_ui_queue()
+            self._apply_state_change(event)
+        else:
+            self._ui_queue.put(event)
+    
+    def _drain_ui_queue(self, max_events: int = 32):
+        """
+        Apply pending state changes to the UI.
+        
+        Args:
+            max_events: Maximum number of events to apply per call
+        """
+        for _ in range(max_events):
+            try:
+                event = self._ui_queue.get_nowait()
+            except queue.Empty:
+                return
+            self._apply_state_change(event)
+    
+    def _apply_state_change(self, event: StateChangeEvent):
+        """
+        Update the UI for a state change.
+        
         Args:
             event: State change event data
         """
@@ -125,6 +193,7 @@ class UIManager:
             self.update_status("Live view active - Press S to take a photo")
             self.info_label.config(text="Live View")
             self.camera_status_bar.frame.pack(side=tk.TOP, fill=tk.X)
+            self._ui_chrome_h = None
         
         elif event.new_state == AppState.TAKING_PHOTO:
             self.update_status("Taking photo...")
@@ -136,6 +205,7 @@ class UIManager:
             self.update_status("Preview - S to accept and download, R to reject")
             self.info_label.config(text=f"Preview: {event.context.get('filename', '')}")
             self.camera_status_bar.frame.pack_forget()
+            self._ui_chrome_h = None
         
         elif event.new_state == AppState.DOWNLOADING:
             self.update_status("Downloading image...")
@@ -155,7 +225,15 @@ class UIManager:
             message: Status message to display
         """
         self.status_bar.config(text=message)
-        self.root.update_idletasks()  # Force GUI update
+        
+        # Coalesce redraws: rapid state transitions share one idle pass
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after_idle(self._flush)
+    
+    def _flush(self):
+        """Clear the pending-redraw flag once Tk has processed idle tasks."""
+        self._flush_scheduled = False
     
     def update_fps(self, fps: float):
         """
@@ -174,15 +252,15 @@ class UIManager:
             message: Health status message
             status: Status level ("ok", "warning", "critical")
         """
-        self.health_label.config(text=message)
-        
         # Set color based on status
         if status == "warning":
-            self.health_label.config(fg="orange")
+            color = "orange"
         elif status == "critical":
-            self.health_label.config(fg="red")
+            color = "red"
         else:
-            self.health_label.config(fg="black")
+            color = "black"
+        
+        self.health_label.config(text=message, fg=color)
     
     def update_quality(self, quality: str):
         """
@@ -205,6 +283,7 @@ class UIManager:
             exposure_warning: Exposure warning
             focus_status: Focus status
         """
+        # CameraStatusBar.update skips the redraw when nothing changed
         self.camera_status_bar.update(
             aperture=aperture,
             shutter_speed=shutter_speed,
@@ -235,31 +314,39 @@ class UIManager:
         
         if center:
             # Center the window on screen
-            screen_width = self.root.winfo_screenwidth()
-            screen_height = self.root.winfo_screenheight()
-            x_position = int((screen_width - width) / 2)
-            y_position = int((screen_height - height) / 2)
+            x_position = int((self._screen_w - width) / 2)
+            y_position = int((self._screen_h - height) / 2)
             self.root.geometry(f"+{x_position}+{y_position}")
     
     def resize_for_image(self, width: int, height: int):
         """
         Resize window to fit an image with specified dimensions.
         
+        Resizes are debounced so that quick successive image swaps
+        only resize the window once.
+        
         Args:
             width: Image width
             height: Image height
         """
-        # Get screen dimensions
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
+        if self.resize_timer is not None:
+            self.root.after_cancel(self.resize_timer)
+        self.resize_timer = self.root.after(50, lambda: self._do_resize(width, height))
+    
+    def _do_resize(self, width: int, height: int):
+        """
+        Perform a window resize scheduled by resize_for_image.
         
-        # Calculate UI element heights
-        status_bar_height = self.status_bar.winfo_reqheight()
-        camera_status_height = self.camera_status_bar.height
-        info_frame_height = self.info_frame.winfo_reqheight()
+        Args:
+            width: Image width
+            height: Image height
+        """
+        self.resize_timer = None
+        screen_width = self._screen_w
+        screen_height = self._screen_h
         
         # Total UI height
-        ui_height = status_bar_height + camera_status_height + info_frame_height
+        ui_height = self._get_ui_chrome_height()
         
         # Apply 5% margin to available screen space
         margin_percentage = 0.05
@@ -280,6 +367,19 @@ class UIManager:
         # Set window size and center
         self.set_window_size(new_width, new_height)
     
+    def _get_ui_chrome_height(self) -> int:
+        """
+        Get the combined height of the UI bars around the image.
+        
+        Returns:
+            int: Height in pixels
+        """
+        if self._ui_chrome_h is None:
+            self._ui_chrome_h = (self.status_bar.winfo_reqheight()
+                                 + self.camera_status_bar.height
+                                 + self.info_frame.winfo_reqheight())
+        return self._ui_chrome_h
+    
     def set_initial_window_size(self, quality: str):
         """
         Set initial window size based on quality setting.
@@ -303,7 +403,8 @@ class UIManager:
             title: Dialog title
             message: Message to display
         """
-        tk.messagebox.showinfo(title, message)
+        from tkinter import messagebox
+        messagebox.showinfo(title, message)
     
     def show_error(self, title: str, message: str):
         """
@@ -313,7 +414,8 @@ class UIManager:
             title: Dialog title
             message: Error message to display
         """
-        tk.messagebox.showerror(title, message)
+        from tkinter import messagebox
+        messagebox.showerror(title, message)
     
     def show_confirmation(self, title: str, message: str) -> bool:
         """
@@ -326,7 +428,8 @@ class UIManager:
         Returns:
             bool: True if confirmed, False otherwise
         """
-        return tk.messagebox.askyesno(title, message)
+        from tkinter import messagebox
+        return messagebox.askyesno(title, message)
     
     def schedule_task(self, delay_ms: int, callback: Callable) -> str:
         """
@@ -350,7 +453,56 @@ class UIManager:
         """
         self.root.after_cancel(timer_id)
     
+    def schedule_periodic(self, interval_ms: int, callback: Callable) -> Dict[str, Any]:
+        """
+        Run a task repeatedly at a fixed interval.
+        
+        The timer is re-armed after each run, so callbacks don't need
+        to reschedule themselves.
+        
+        Args:
+            interval_ms: Interval in milliseconds
+            callback: Function to call
+            
+        Returns:
+            dict: Token for cancel_periodic
+        """
+        token = {"alive": True, "id": None}
+        
+        def _tick():
+            if not token["alive"]:
+                return
+            try:
+                callback()
+            finally:
+                if token["alive"]:
+                    token["id"] = self.root.after(interval_ms, _tick)
+        
+        token["id"] = self.root.after(interval_ms, _tick)
+        return token
+    
+    def cancel_periodic(self, token: Dict[str, Any]):
+        """
+        Cancel a periodic task.
+        
+        Args:
+            token: Token from schedule_periodic
+        """
+        token["alive"] = False
+        if token["id"] is not None:
+            self.root.after_cancel(token["id"])
+            token["id"] = None
+    
     def force_update(self):
-        """Force an immediate UI update."""
+        """Force an immediate redraw of pending geometry and display changes."""
         self.root.update_idletasks()
+    
+    def pump_events(self):
+        """
+        Process all pending events, including user input.
+        
+        Re-enters the event loop, so handlers (key presses, timers) may run
+        inside the caller. Only use this where a full event pump is really
+        needed; prefer force_update otherwise.
+        """
         self.root.update()
@@ -27,11 +27,25 @@ class PerformanceMonitor:
         self.error_times = collections.deque(maxlen=20)
         self.processing_times = collections.deque(maxlen=50)
         
+        # Sliding-window max of inter-frame gaps, stored as (frame_time, gap)
+        # pairs with strictly decreasing gaps; the front is the current max.
+        # frame_time is the earlier frame of the pair, so a gap leaves the
+        # window together with that frame.
+        self._gap_window = collections.deque()
+        
+        # Running sum and monotonic (sequence, value) deques giving the
+        # min/max of the processing times still in processing_times
+        self._pt_sum = 0.0
+        self._pt_seq = 0
+        self._pt_min = collections.deque()
+        self._pt_max = collections.deque()
+        
         self.last_frame_time = 0
         self.last_status_message = ""
         
         # Track FPS
         self.fps_values = collections.deque(maxlen=10)
+        self._fps_sum = 0.0
         self.frame_count = 0
         self.last_fps_time = time.time()
         self.current_fps = 0
@@ -56,6 +70,12 @@ class PerformanceMonitor:
         
         # Only record if it's been at least 16ms (60fps max) since last frame
         if current_time - self.last_frame_time >= 0.016:
+            self._evict_expired(current_time)
+            
+            if self.frame_times:
+                self._push_gap(self.frame_times[-1], current_time - self.frame_times[-1])
+            if len(self.frame_times) == self.frame_times.maxlen:
+                self._drop_oldest_frame()
             self.frame_times.append(current_time)
             self.last_frame_time = current_time
             
@@ -63,7 +83,7 @@ class PerformanceMonitor:
                 self.error_times.append(current_time)
             
             if processing_time is not None:
-                self.processing_times.append(processing_time)
+                self._record_processing_time(processing_time)
             
             # Update frame count for FPS calculation
             self.frame_count += 1
@@ -72,10 +92,74 @@ class PerformanceMonitor:
             elapsed = current_time - self.last_fps_time
             if elapsed >= 1.0:
                 self.current_fps = self.frame_count / elapsed
+                if len(self.fps_values) == self.fps_values.maxlen:
+                    self._fps_sum -= self.fps_values[0]
+                self._fps_sum += self.current_fps
                 self.fps_values.append(self.current_fps)
                 self.frame_count = 0
                 self.last_fps_time = current_time
     
+    def _record_processing_time(self, processing_time: float) -> None:
+        """
+        Add a processing time sample and update the running statistics.
+        
+        Args:
+            processing_time: Time taken to process the frame (seconds)
+        """
+        if len(self.processing_times) == self.processing_times.maxlen:
+            self._pt_sum -= self.processing_times[0]
+        self.processing_times.append(processing_time)
+        self._pt_sum += processing_time
+        
+        seq = self._pt_seq
+        self._pt_seq += 1
+        
+        while self._pt_min and self._pt_min[-1][1] >= processing_time:
+            self._pt_min.pop()
+        self._pt_min.append((seq, processing_time))
+        while self._pt_max and self._pt_max[-1][1] <= processing_time:
+            self._pt_max.pop()
+        self._pt_max.append((seq, processing_time))
+        
+        # Drop extremes of samples the bounded deque has evicted
+        oldest_seq = seq - self.processing_times.maxlen
+        if self._pt_min[0][0] <= oldest_seq:
+            self._pt_min.popleft()
+        if self._pt_max[0][0] <= oldest_seq:
+            self._pt_max.popleft()
+    
+    def _push_gap(self, frame_time: float, gap: float) -> None:
+        """
+        Add an inter-frame gap to the sliding-window max.
+        
+        Args:
+            frame_time: Time of the earlier frame of the pair
+            gap: Time between the two frames (seconds)
+        """
+        while self._gap_window and self._gap_window[-1][1] <= gap:
+            self._gap_window.pop()
+        self._gap_window.append((frame_time, gap))
+    
+    def _drop_oldest_frame(self) -> None:
+        """Remove the oldest frame and the gap that started at it."""
+        oldest = self.frame_times.popleft()
+        if self._gap_window and self._gap_window[0][0] <= oldest:
+            self._gap_window.popleft()
+    
+    def _evict_expired(self, current_time: float) -> None:
+        """
+        Drop frames and errors that have fallen out of the time window.
+        
+        Args:
+            current_time: Current timestamp
+        """
+        window_start = current_time - self.window_size
+        
+        while self.frame_times and self.frame_times[0] < window_start:
+            self._drop_oldest_frame()
+        while self.error_times and self.error_times[0] < window_start:
+            self.error_times.popleft()
+    
     def get_fps(self) -> float:
         """
         Get the current frames per second.
@@ -85,7 +169,7 @@ class PerformanceMonitor:
         """
         if len(self.fps_values) > 0:
             # Average of recent FPS calculations
-            return sum(self.fps_values) / len(self.fps_values)
+            return self._fps_sum / len(self.fps_values)
         return self.current_fps
     
     def get_health_status(self) -> Tuple[str, float, float, float]:
@@ -99,12 +183,10 @@ class PerformanceMonitor:
             - error_rate: Percentage of frames with errors
             - gap: Longest time between frames in seconds
         """
-        current_time = time.time()
-        window_start = current_time - self.window_size
-        
-        # Count frames in the window
-        frames_in_window = sum(1 for t in self.frame_times if t >= window_start)
-        errors_in_window = sum(1 for t in self.error_times if t >= window_start)
+        # Only frames and errors inside the window remain after eviction
+        self._evict_expired(time.time())
+        frames_in_window = len(self.frame_times)
+        errors_in_window = len(self.error_times)
         
         # Calculate FPS
         fps = frames_in_window / self.window_size if frames_in_window > 0 else 0
@@ -112,13 +194,8 @@ class PerformanceMonitor:
         # Calculate error rate
         error_rate = errors_in_window / frames_in_window if frames_in_window > 0 else 0
         
-        # Calculate largest gap between frames
-        sorted_times = sorted([t for t in self.frame_times if t >= window_start])
-        max_gap = 0
-        
-        if len(sorted_times) >= 2:
-            gaps = [sorted_times[i] - sorted_times[i-1] for i in range(1, len(sorted_times))]
-            max_gap = max(gaps) if gaps else 0
+        # Largest gap between frames
+        max_gap = self._gap_window[0][1] if self._gap_window else 0
         
         # Determine status
         status = "ok"
@@ -139,11 +216,10 @@ class PerformanceMonitor:
         if not self.processing_times:
             return {"min": 0, "max": 0, "avg": 0}
         
-        times = list(self.processing_times)
         return {
-            "min": min(times),
-            "max": max(times),
-            "avg": sum(times) / len(times)
+            "min": self._pt_min[0][1],
+            "max": self._pt_max[0][1],
+            "avg": self._pt_sum / len(self.processing_times)
         }
     
     def get_status_message(self) -> str:
@@ -204,7 +280,12 @@ class PerformanceMonitor:
         self.frame_times.clear()
         self.error_times.clear()
         self.processing_times.clear()
+        self._pt_sum = 0.0
+        self._pt_min.clear()
+        self._pt_max.clear()
+        self._gap_window.clear()
         self.fps_values.clear()
+        self._fps_sum = 0.0
         self.frame_count = 0
         self.last_fps_time = time.time()
         self.current_fps = 0
@@ -3,8 +3,44 @@ Settings manager for the Film Scanner application.
 Handles loading, saving, and accessing application settings.
 """
 import os
+import copy
 import json
-from typing import Any, Dict, Optional
+import functools
+from typing import Any, Dict, Optional, Tuple
+
+
+@functools.lru_cache(maxsize=128)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """
+    Split a dot-notation setting key into its parts.
+    
+    Args:
+        key: Setting key, e.g. "ui.show_camera_status"
+        
+    Returns:
+        tuple: Key parts
+    """
+    return tuple(key.split('.'))
+
+
+def _flatten(settings: Dict[str, Any], prefix: str) -> Dict[str, Any]:
+    """
+    Build dot-notation entries for all values nested under a prefix.
+    
+    Args:
+        settings: Nested settings dictionary
+        prefix: Dot-notation path of the dictionary
+        
+    Returns:
+        dict: Mapping of "prefix.key" paths to values, at every depth
+    """
+    flat = {}
+    for key, value in settings.items():
+        path = f"{prefix}.{key}"
+        flat[path] = value
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+    return flat
 
 
 class SettingsManager:
@@ -54,10 +90,17 @@ class SettingsManager:
             self.config_file = config_file
         
         # Initialize settings with defaults
-        self.settings = self.DEFAULT_SETTINGS.copy()
+        self.settings = copy.deepcopy(self.DEFAULT_SETTINGS)
+        
+        # Dot-notation index of nested settings, e.g. "ui.show_camera_status"
+        self._flat = {}
         
-        # Load settings from file
-        self.load_settings()
+        # (raw, expanded) output directory, refreshed when the raw value changes
+        self._output_dir_cache = None
+        
+        # Load settings from file; defaults are written out on the first save
+        self._dirty = not self.load_settings()
+        self._rebuild_flat()
     
     def load_settings(self) -> bool:
         """
@@ -73,6 +116,7 @@ class SettingsManager:
                 
                 # Update settings with loaded values
                 self.settings.update(loaded_settings)
+                self._rebuild_flat()
                 return True
         except Exception as e:
             print(f"Error loading settings: {e}")
@@ -86,9 +130,18 @@ class SettingsManager:
         Returns:
             bool: True if settings were saved successfully
         """
+        # Nothing changed since the last load/save
+        if not self._dirty:
+            return True
+        
         try:
-            with open(self.config_file, 'w') as f:
+            # Write to a temporary file and swap it in so a crash mid-write
+            # never leaves a truncated settings file behind
+            tmp_file = self.config_file + ".tmp"
+            with open(tmp_file, 'w') as f:
                 json.dump(self.settings, f, indent=4)
+            os.replace(tmp_file, self.config_file)
+            self._dirty = False
             return True
         except Exception as e:
             print(f"Error saving settings: {e}")
@@ -106,15 +159,8 @@ class SettingsManager:
             Setting value or default
         """
         # Handle nested keys with dot notation
-        if '.' in key:
-            parts = key.split('.')
-            value = self.settings
-            for part in parts:
-                if isinstance(value, dict) and part in value:
-                    value = value[part]
-                else:
-                    return default
-            return value
+        if key in self._flat:
+            return self._flat[key]
         
         # Handle simple keys
         return self.settings.get(key, default)
@@ -128,8 +174,8 @@ class SettingsManager:
             value: Setting value
         """
         # Handle nested keys with dot notation
-        if '.' in key:
-            parts = key.split('.')
+        parts = _split_key(key)
+        if len(parts) > 1:
             target = self.settings
             
             # Navigate to the correct nested dictionary
@@ -137,12 +183,16 @@ class SettingsManager:
                 if part not in target:
                     target[part] = {}
                 target = target[part]
-            
-            # Set the value
-            target[parts[-1]] = value
+            key = parts[-1]
         else:
             # Handle simple keys
-            self.settings[key] = value
+            target = self.settings
+        
+        # Set the value, only marking settings dirty on an actual change
+        if key not in target or target[key] != value:
+            target[key] = value
+            self._dirty = True
+            self._rebuild_flat(parts[0])
     
     def get_all(self) -> Dict[str, Any]:
         """
@@ -155,7 +205,29 @@ class SettingsManager:
     
     def reset_to_defaults(self) -> None:
         """Reset all settings to default values."""
-        self.settings = self.DEFAULT_SETTINGS.copy()
+        self.settings = copy.deepcopy(self.DEFAULT_SETTINGS)
+        self._dirty = True
+        self._rebuild_flat()
+    
+    def _rebuild_flat(self, top_key: Optional[str] = None) -> None:
+        """
+        Rebuild the dot-notation index of nested settings.
+        
+        Args:
+            top_key: Only rebuild entries under this top-level key
+        """
+        if top_key is None:
+            keys = list(self.settings)
+            self._flat = {}
+        else:
+            keys = [top_key]
+            prefix = top_key + "."
+            self._flat = {k: v for k, v in self._flat.items() if not k.startswith(prefix)}
+        
+        for key in keys:
+            value = self.settings.get(key)
+            if isinstance(value, dict):
+                self._flat.update(_flatten(value, key))
     
     def get_output_directory(self) -> str:
         """
@@ -165,7 +237,9 @@ class SettingsManager:
             str: Output directory path
         """
         output_dir = self.get("output_directory", "~/Pictures/FilmScans")
-        return os.path.expanduser(output_dir)
+        if self._output_dir_cache is None or self._output_dir_cache[0] != output_dir:
+            self._output_dir_cache = (output_dir, os.path.expanduser(output_dir))
+        return self._output_dir_cache[1]
     
     def set_output_directory(self, directory: str) -> None:
         """
@@ -2,10 +2,9 @@
 """
 Script to download a screennail directly via HTTP from an Olympus camera.
 """
-import io
 import sys
 import time
-import requests
+import urllib3
 from PIL import Image
 from olympuswifi.camera import OlympusCamera  # Only used for listing images
 
@@ -24,68 +23,78 @@ def get_screennail_direct():
         print("Connecting to camera...")
         camera = OlympusCamera()
         
-        # Switch to playback mode
-        print("Switching to playback mode...")
-        requests.get(f"{BASE_URL}/switch_cammode.cgi?mode=play", headers=HEADERS)
-        time.sleep(1)  # Short pause to ensure mode switch completes
+        # Reuse a single keep-alive connection for all direct requests; the
+        # camera never redirects or sets cookies, so raw urllib3 is enough
+        http = urllib3.PoolManager(num_pools=1, maxsize=1, headers=HEADERS)
         
-        # List images using the library
-        print("Listing images...")
-        images = list(camera.list_images(dir='/DCIM/100OLYMP'))
-        if not images:
-            print("Error: No images found on camera.")
-            return False
-        
-        # Get the last image
-        last_image = images[-1]
-        print(f"Selected image: {last_image.file_name}")
-        
-        # Construct URLs for different image types
-        image_path = last_image.file_name
-        thumbnail_url = f"{BASE_URL}/get_thumbnail.cgi?DIR={image_path}"
-        screennail_url = f"{BASE_URL}/get_screennail.cgi?DIR={image_path}"
-        full_image_url = f"{BASE_URL}{image_path}"
-        
-        # Try to download the screennail
-        print(f"Downloading screennail via direct HTTP request...")
-        print(f"URL: {screennail_url}")
-        response = requests.get(screennail_url, headers=HEADERS)
-        
-        if response.status_code == 200:
-            # Process the image data
-            screennail_data = response.content
+        with http:
+            # Switch to playback mode
+            print("Switching to playback mode...")
+            http.request("GET", f"{BASE_URL}/switch_cammode.cgi?mode=play")
+            
+            # Poll until the image list is served rather than waiting a fixed second
+            for _ in range(20):
+                if http.request("GET", f"{BASE_URL}/get_imglist.cgi?DIR=/DCIM/100OLYMP").status == 200:
+                    break
+                time.sleep(0.05)
+            
+            # List images using the library
+            print("Listing images...")
+            images = list(camera.list_images(dir='/DCIM/100OLYMP'))
+            if not images:
+                print("Error: No images found on camera.")
+                return False
+            
+            # Get the last image
+            last_image = images[-1]
+            print(f"Selected image: {last_image.file_name}")
+            
+            # Construct URLs for different image types
+            image_path = last_image.file_name
+            thumbnail_url = f"{BASE_URL}/get_thumbnail.cgi?DIR={image_path}"
+            screennail_url = f"{BASE_URL}/get_screennail.cgi?DIR={image_path}"
+            full_image_url = f"{BASE_URL}{image_path}"
+            
+            # Try to download the screennail
+            print(f"Downloading screennail via direct HTTP request...")
+            print(f"URL: {screennail_url}")
+            response = http.request("GET", screennail_url, preload_content=False)
             
-            try:
-                image = Image.open(io.BytesIO(screennail_data))
-                width, height = image.size
-                print(f"\nScreennail Dimensions: {width} × {height} pixels")
-                print(f"Image Format: {image.format}")
-                print(f"Mode: {image.mode}")
-                print(f"Data Size: {len(screennail_data)} bytes")
-                
-                # Save the screennail for inspection
-                output_file = "screennail_direct.jpg"
-                image.save(output_file)
-                print(f"Saved screennail to: {output_file}")
-                
-                # Now try to get thumbnail for comparison
-                print("\nDownloading thumbnail for comparison...")
-                thumb_response = requests.get(thumbnail_url, headers=HEADERS)
-                if thumb_response.status_code == 200:
-                    thumb_image = Image.open(io.BytesIO(thumb_response.content))
-                    print(f"Thumbnail Dimensions: {thumb_image.size[0]} × {thumb_image.size[1]} pixels")
-                    print(f"Thumbnail Data Size: {len(thumb_response.content)} bytes")
-                    thumb_image.save("thumbnail_direct.jpg")
-                    print(f"Saved thumbnail to: thumbnail_direct.jpg")
-                
-                return True
-            except Exception as e:
-                print(f"Error processing image: {e}")
+            if response.status == 200:
+                try:
+                    # Decode straight from the socket instead of buffering the body first
+                    image = Image.open(response)
+                    response.release_conn()
+                    width, height = image.size
+                    print(f"\nScreennail Dimensions: {width} × {height} pixels")
+                    print(f"Image Format: {image.format}")
+                    print(f"Mode: {image.mode}")
+                    print(f"Data Size: {response.headers.get('Content-Length', '?')} bytes")
+                    
+                    # Save the screennail for inspection
+                    output_file = "screennail_direct.jpg"
+                    image.save(output_file)
+                    print(f"Saved screennail to: {output_file}")
+                    
+                    # Now try to get thumbnail for comparison
+                    print("\nDownloading thumbnail for comparison...")
+                    thumb_response = http.request("GET", thumbnail_url, preload_content=False)
+                    if thumb_response.status == 200:
+                        thumb_image = Image.open(thumb_response)
+                        thumb_response.release_conn()
+                        print(f"Thumbnail Dimensions: {thumb_image.size[0]} × {thumb_image.size[1]} pixels")
+                        print(f"Thumbnail Data Size: {thumb_response.headers.get('Content-Length', '?')} bytes")
+                        thumb_image.save("thumbnail_direct.jpg")
+                        print(f"Saved thumbnail to: thumbnail_direct.jpg")
+                    
+                    return True
+                except Exception as e:
+                    print(f"Error processing image: {e}")
+                    return False
+            else:
+                print(f"Error: HTTP status {response.status}")
+                print(f"Response: {response.data.decode(errors='replace')}")
                 return False
-        else:
-            print(f"Error: HTTP status {response.status_code}")
-            print(f"Response: {response.text}")
-            return False
             
     except Exception as e:
         print(f"Error: {e}")
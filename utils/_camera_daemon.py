@@ -0,0 +1,278 @@
+"""
+Optional shared camera connection for running the utility scripts as a suite.
+
+With OLY_DAEMON set, get_camera() hands out a CameraProxy that forwards
+camera commands over a Unix socket to a background process. That process
+keeps one OlympusCamera connected, in rec mode and with live view running,
+so later scripts skip the connect and live view start-up. Without OLY_DAEMON
+get_camera() simply returns a new OlympusCamera.
+
+The daemon exits after OLY_DAEMON_IDLE seconds (default 600) without
+requests, or on SIGTERM, stopping live view first.
+
+The socket is private to the user that started the daemon. By default it
+lives in $XDG_RUNTIME_DIR, or the temp directory if that isn't set; set
+OLY_DAEMON to a path to use another location.
+
+Run directly to start a daemon in the foreground:
+    python _camera_daemon.py [socket path]
+"""
+import base64
+import fcntl
+import json
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from requests.structures import CaseInsensitiveDict
+from olympuswifi.camera import OlympusCamera, RequestError, ResultError
+
+
+def _default_socket():
+    """Per-user socket path, in the runtime directory when there is one"""
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"olympus-camera-{os.getuid()}.sock")
+
+
+def _socket_path():
+    """Socket path from OLY_DAEMON, unless it is just a flag like "1" """
+    path = os.environ.get("OLY_DAEMON", "")
+    return path if os.sep in path else _default_socket()
+
+
+def get_camera():
+    """Return a camera for this script, shared through the daemon when OLY_DAEMON is set"""
+    if not os.environ.get("OLY_DAEMON"):
+        return OlympusCamera()
+    return CameraProxy(_socket_path())
+
+
+def _encode_response(response):
+    """Serialize a requests.Response for the wire"""
+    return {
+        "status_code": response.status_code,
+        "headers": dict(response.headers),
+        "url": response.url,
+        "content": base64.b64encode(response.content).decode("ascii"),
+    }
+
+
+class _Drained:
+    """Stand-in for response.raw; the body has already been read"""
+
+    def drain_conn(self):
+        pass
+
+
+class RemoteResponse:
+    """The parts of requests.Response the utility scripts use"""
+
+    def __init__(self, data):
+        self.status_code = data["status_code"]
+        self.headers = CaseInsensitiveDict(data["headers"])
+        self.url = data["url"]
+        self.content = base64.b64decode(data["content"])
+        self.raw = _Drained()
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def iter_content(self, chunk_size=65536):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class CameraProxy(OlympusCamera):
+    """
+    OlympusCamera whose camera I/O happens in the daemon process.
+
+    Validation and XML helpers are inherited unchanged; the command list,
+    property table and camera info are copied from the daemon once.
+    """
+
+    def __init__(self, path):
+        # Deliberately not calling OlympusCamera.__init__, which connects
+        self._path = path
+        state = self._call("state", spawn=True)
+        self.commands = {name: self.CmdDescr(method, args)
+                         for name, (method, args) in state["commands"].items()}
+        self.camprop_name2values = state["props"]
+        self.camera_info = state["info"]
+        self.versions = state["versions"]
+        self.supported = set(state["supported"])
+
+    def _connect(self, spawn):
+        """Open a connection to the daemon, starting it if needed"""
+        sock = None
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self._path)
+            return sock
+        except (FileNotFoundError, ConnectionRefusedError):
+            if sock is not None:
+                sock.close()
+            if not spawn:
+                raise
+
+        # Scripts started together take turns here: the first one starts the
+        # daemon and holds the lock until it is up, the others then connect
+        with open(self._path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                return self._connect(spawn=False)
+            except (FileNotFoundError, ConnectionRefusedError):
+                pass
+
+            if os.path.exists(self._path):
+                os.unlink(self._path)  # Left behind by a daemon that died
+            subprocess.Popen([sys.executable, os.path.abspath(__file__), self._path],
+                             stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL, start_new_session=True)
+
+            # Connecting to the camera takes a few seconds
+            deadline = time.monotonic() + 30
+            while time.monotonic() < deadline:
+                time.sleep(0.2)
+                try:
+                    return self._connect(spawn=False)
+                except (FileNotFoundError, ConnectionRefusedError):
+                    pass
+        raise ConnectionError(f"Camera daemon did not start on {self._path}")
+
+    def _call(self, method, *args, spawn=False, **kwargs):
+        """Run one camera method in the daemon and return its result"""
+        with self._connect(spawn) as sock:
+            sock.sendall(json.dumps({"method": method, "args": args, "kwargs": kwargs}).encode() + b"\n")
+            with sock.makefile("rb") as reply_file:
+                reply = json.loads(reply_file.readline())
+
+        if "error" in reply:
+            if reply["error"] == "RequestError":
+                raise RequestError(reply["message"])
+            if reply["error"] == "ResultError":
+                raise ResultError(reply["message"], RemoteResponse(reply["response"]))
+            raise RuntimeError(f"{reply['error']}: {reply['message']}")
+        if "response" in reply:
+            return RemoteResponse(reply["response"])
+        return reply["result"]
+
+    def send_command(self, command, **args):
+        return self._call("send_command", command, **args)
+
+    def get_camprop(self, propname):
+        return self._call("get_camprop", propname)
+
+    def set_camprop(self, propname, value):
+        return self._call("set_camprop", propname, value)
+
+    def start_liveview(self, port, lvqty):
+        return self._call("start_liveview", port, lvqty)
+
+    def stop_liveview(self):
+        # Live view stays up for the next script; the daemon stops it on exit
+        pass
+
+
+class _CameraHandler(socketserver.StreamRequestHandler):
+    """Serve one JSON request per connection"""
+
+    def handle(self):
+        self.server.last_request = time.monotonic()
+        request = json.loads(self.rfile.readline())
+        try:
+            result = self.server.dispatch(request["method"], request["args"], request["kwargs"])
+            if hasattr(result, "status_code"):
+                reply = {"response": _encode_response(result)}
+            else:
+                reply = {"result": result}
+        except ResultError as e:
+            reply = {"error": "ResultError", "message": str(e), "response": _encode_response(e.response)}
+        except Exception as e:
+            reply = {"error": type(e).__name__, "message": str(e)}
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class _CameraServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Owns the shared camera connection"""
+
+    daemon_threads = True
+    ALLOWED = {"send_command", "get_camprop", "set_camprop", "start_liveview"}
+
+    def __init__(self, path):
+        self.camera = OlympusCamera()
+        # The camera runs one action at a time
+        self.lock = threading.Lock()
+        self.liveview = None
+        self.last_request = time.monotonic()
+        super().__init__(path, _CameraHandler)
+
+    def server_bind(self):
+        """Bind with a socket only the owner can connect to"""
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def dispatch(self, method, args, kwargs):
+        if method == "state":
+            return {
+                "commands": {name: (descr.method, descr.args) for name, descr in self.camera.commands.items()},
+                "props": self.camera.get_settable_propnames_and_values(),
+                "info": self.camera.get_camera_info(),
+                "versions": self.camera.get_versions(),
+                "supported": sorted(self.camera.get_supported()),
+            }
+        if method not in self.ALLOWED:
+            raise RequestError(f"'{method}' is not available through the camera daemon")
+
+        with self.lock:
+            if method == "start_liveview":
+                # Already streaming with these settings: nothing to do
+                if self.liveview and self.liveview[0] == tuple(args) \
+                        and self.camera._camera_status.liveview_active:
+                    return self.liveview[1]
+                result = self.camera.start_liveview(*args)
+                self.liveview = (tuple(args), result)
+                return result
+            return getattr(self.camera, method)(*args, **kwargs)
+
+    def shutdown_camera(self):
+        """Stop live view before the daemon exits"""
+        try:
+            self.camera.stop_liveview()
+        except Exception as e:
+            print(f"Error stopping live view: {e}")
+
+
+def serve(path, idle_timeout):
+    """Hold the camera connection and serve requests until idle or terminated"""
+    server = _CameraServer(path)
+    # Wake up every second so SIGTERM and the idle timeout are noticed
+    # without waiting for another request
+    server.timeout = 1.0
+    terminated = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: terminated.append(True))
+    try:
+        while not terminated and time.monotonic() - server.last_request < idle_timeout:
+            server.handle_request()
+    finally:
+        server.shutdown_camera()
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1] if len(sys.argv) > 1 else _default_socket(),
+          float(os.environ.get("OLY_DAEMON_IDLE", "600")))
@@ -0,0 +1,261 @@
+"""
+Shared keep-alive HTTP session for the camera utility scripts.
+
+olympuswifi sends every command through the module-level requests.get/post,
+which opens a new TCP connection per call. install_session() swaps in a
+stand-in that routes those calls through one pooled requests.Session.
+"""
+import http.client
+import re
+import socket
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+import olympuswifi.camera as olympus_camera
+from olympuswifi.camera import ResultError
+from olympuswifi.errors import ERROR_CODE_TO_MESSAGE
+
+# Per-thread switch for streamed (unbuffered) response bodies
+_local = threading.local()
+
+# Fallback for pulling a camera error code out of an error message
+_ERROR_CODE = re.compile(r"\b(\d{4})\b")
+
+MISSING_PARAMETER = 1004
+
+
+class CameraError(ResultError):
+    """ResultError with the camera's numeric error code parsed out"""
+
+    def __init__(self, code, msg, response):
+        super().__init__(msg, response)
+        self.code = code
+
+
+def _camera_error(camera, error):
+    """Build a CameraError from a ResultError, parsing its reply once"""
+    code = None
+    try:
+        reply = camera.xml_response(error.response)
+        if isinstance(reply, dict) and str(reply.get('code', '')).isdigit():
+            code = int(reply['code'])
+    except Exception:
+        pass
+    if code is None:
+        match = _ERROR_CODE.search(str(error))
+        code = int(match.group(1)) if match else error.response.status_code
+    hint = ERROR_CODE_TO_MESSAGE.get(code)
+    msg = f"{error} ({hint})" if hint else str(error)
+    return CameraError(code, msg, error.response)
+
+
+class _SessionRequests:
+    """Stand-in for the requests module that sends through a Session"""
+
+    def __init__(self, session):
+        self.session = session
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("stream", getattr(_local, "stream", False))
+        return self.session.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        kwargs.setdefault("stream", getattr(_local, "stream", False))
+        return self.session.post(url, **kwargs)
+
+    def __getattr__(self, name):
+        # requests.codes and friends
+        return getattr(requests, name)
+
+
+def install_session(pool_maxsize=4, retries=2):
+    """
+    Route all olympuswifi camera requests through one keep-alive session.
+
+    Call before creating the OlympusCamera so the connect handshake is
+    pooled too. Only failed connection attempts are retried, so camera
+    commands are never sent twice.
+
+    Returns the session so callers can close it when done.
+    """
+    session = requests.Session()
+    session.headers["Connection"] = "keep-alive"
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=retries, connect=retries, read=0, status=0,
+                          backoff_factor=0.1)
+    )
+    session.mount("http://", adapter)
+    olympus_camera.requests = _SessionRequests(session)
+    return session
+
+
+@contextmanager
+def streaming():
+    """
+    Leave response bodies unread for camera requests made in this block.
+
+    Callers read them with iter_content() and must close the response so
+    the connection goes back to the pool.
+    """
+    _local.stream = True
+    try:
+        yield
+    finally:
+        _local.stream = False
+
+
+def send_command_noresp(camera, command, **args):
+    """
+    Send a camera command whose reply body is not needed.
+
+    The body is discarded unread so the connection goes straight back to the
+    pool without being decoded. Returns the HTTP status code; camera error
+    replies are raised as CameraError.
+    """
+    try:
+        with streaming():
+            response = camera.send_command(command, **args)
+    except ResultError as e:
+        raise _camera_error(camera, e) from e
+    try:
+        response.raw.drain_conn()
+        return response.status_code
+    finally:
+        response.close()
+
+
+def prepare_command(session, camera, command, **args):
+    """
+    Validate and build a camera GET command once, for repeated sending.
+
+    Returns a PreparedRequest to pass to send_prepared().
+    """
+    camera.check_valid_command(command, args)
+    request = requests.Request('GET', f"{camera.URL_PREFIX}{command}.cgi",
+                               headers=camera.HEADERS, params=args)
+    return session.prepare_request(request)
+
+
+def send_prepared(session, prepared):
+    """Send a prepared command, discard the reply body and return the status code"""
+    response = session.send(prepared, stream=True)
+    try:
+        response.raw.drain_conn()
+        return response.status_code
+    finally:
+        response.close()
+
+
+class _SharedReader:
+    """Buffered socket reader shared by consecutive pipelined responses"""
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def makefile(self, *args, **kwargs):
+        # HTTPResponse reads from whatever makefile() returns
+        return self
+
+    def close(self):
+        # Each HTTPResponse closes its file when done; keep it for the next one
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self.reader, name)
+
+
+def _pipelined_error(camera, url, response, body):
+    """Build the CameraError send_command_noresp would raise for a pipelined reply"""
+    reply = requests.Response()
+    reply.status_code = response.status
+    reply.headers = CaseInsensitiveDict(response.getheaders())
+    reply.url = url
+    reply._content = body
+    text = reply.text.replace("\r\n", "")
+    return _camera_error(camera, ResultError(f"Error #{response.status} for url '{url}': {text}.", reply))
+
+
+def _send_serially(camera, commands, errors):
+    """Send commands one at a time, collecting camera errors instead of stopping"""
+    statuses = []
+    for command, args in commands:
+        try:
+            statuses.append(send_command_noresp(camera, command, **args))
+        except CameraError as e:
+            errors.append(e)
+            statuses.append(e.response.status_code)
+    return statuses
+
+
+def pipeline(camera, commands, timeout=5.0):
+    """
+    Send several GET commands back to back on one connection.
+
+    All requests are written before the first reply is read, so the camera
+    can start on the next command without waiting a round trip. If no
+    separate connection can be opened, or the connection breaks before every
+    reply is in, the unanswered commands are sent one at a time instead; a
+    command whose reply was lost may then reach the camera twice.
+
+    Every command is sent even if an earlier one fails, so a sequence such
+    as a shutter release is never left half done.
+
+    Args:
+        camera: Connected OlympusCamera
+        commands: List of (command, args dict) pairs
+        timeout: Socket timeout in seconds
+
+    Returns:
+        list: HTTP status code for each command
+
+    Raises:
+        CameraError: For the first command the camera rejected, once all
+            commands have been sent
+    """
+    url = urlsplit(camera.URL_PREFIX)
+    targets = []
+    requests_data = []
+    for command, args in commands:
+        camera.check_valid_command(command, args)
+        target = f"{url.path}{command}.cgi"
+        if args:
+            target += "?" + urlencode(args)
+        targets.append(target)
+        lines = [f"GET {target} HTTP/1.1"]
+        lines += [f"{key}: {value}" for key, value in camera.HEADERS.items()]
+        requests_data.append(("\r\n".join(lines) + "\r\n\r\n").encode("ascii"))
+
+    statuses = []
+    errors = []
+    try:
+        sock = socket.create_connection((url.hostname, url.port or 80), timeout=timeout)
+    except OSError:
+        # Nothing was sent yet, so this can't repeat a command
+        statuses = _send_serially(camera, commands, errors)
+    else:
+        try:
+            with sock:
+                sock.sendall(b"".join(requests_data))
+                reader = _SharedReader(sock.makefile("rb"))
+                for target in targets:
+                    response = http.client.HTTPResponse(reader)
+                    response.begin()
+                    body = response.read()
+                    if response.status not in (200, 202):
+                        errors.append(_pipelined_error(
+                            camera, f"{url.scheme}://{url.netloc}{target}", response, body))
+                    statuses.append(response.status)
+        except (OSError, http.client.HTTPException):
+            # Connection closed or a reply we can't frame: finish the rest serially
+            statuses += _send_serially(camera, commands[len(statuses):], errors)
+
+    if errors:
+        raise errors[0]
+    return statuses
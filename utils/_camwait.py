@@ -0,0 +1,37 @@
+"""
+Property polling for the camera utility scripts.
+
+A reply to a cheap request such as get_caminfo only says the camera is
+answering HTTP; it says nothing about focus lock, exposure or a mode switch
+having finished. Where a command's effect shows up in a camera property,
+wait_ready() polls for it with a short exponential backoff; everywhere
+else the scripts keep fixed sleeps.
+"""
+import time
+
+
+def wait_ready(predicate, timeout=2.0, initial=0.01, ceiling=0.1):
+    """
+    Wait until predicate() is true, backing off from initial to ceiling seconds.
+
+    The predicate should check something the command actually changes, such
+    as a property read back with get_camprop. Exceptions raised by the
+    predicate count as "not ready yet". The wait never blocks longer than
+    timeout seconds.
+
+    Returns True if the predicate became true, False on timeout.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while True:
+        try:
+            if predicate():
+                return True
+        except Exception:
+            pass
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, ceiling)
@@ -0,0 +1,32 @@
+"""
+Warm up name and link-layer resolution for the camera address.
+
+The camera's first request otherwise pays for address lookup and an ARP
+exchange on the Wi-Fi interface. prewarm() triggers both up front, before
+the OlympusCamera connect handshake, so those requests don't wait on them.
+"""
+import socket
+from urllib.parse import urlsplit
+
+from olympuswifi.camera import OlympusCamera
+
+# UDP discard port; the datagram only needs to make the kernel resolve the address
+_DISCARD_PORT = 9
+
+
+def prewarm(camera=OlympusCamera):
+    """
+    Resolve the camera host and prime the ARP cache for it.
+
+    Failures are ignored; the first camera request reports any real problem.
+
+    Args:
+        camera: OlympusCamera class or instance whose URL_PREFIX names the host
+    """
+    host = urlsplit(camera.URL_PREFIX).hostname
+    try:
+        socket.getaddrinfo(host, 80, proto=socket.IPPROTO_TCP)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.sendto(b'', (host, _DISCARD_PORT))
+    except OSError:
+        pass
@@ -7,8 +7,30 @@ import sys
 import os
 import json
 import argparse
+import re
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from olympuswifi.camera import OlympusCamera
 
+try:
+    import orjson
+except ImportError:
+    # Optional; fall back to the standard library encoder
+    orjson = None
+
+from _camsession import install_session, streaming
+
+# Keywords the explorations look for in property and command names; the
+# lookahead lets overlapping keywords (e.g. "mf" in "mfocus") all match
+_KEYWORDS = re.compile(r"(?=(zoom|magnif|focus|assist|live|af|mf|lv))")
+
+# Content-Type prefix -> (file extension, saved as text); first match wins
+_RESPONSE_FORMATS = (
+    ("text/xml", ".xml", True),
+    ("text/", ".txt", True),
+    ("image/", ".jpg", False),
+)
+
 
 class CameraExplorer:
     """
@@ -16,11 +38,20 @@ class CameraExplorer:
     for later exploration and reverse engineering.
     """
     
+    # Keep concurrent camera requests low; the camera serves them one by one
+    MAX_WORKERS = 4
+    
     def __init__(self, output_dir="camera_output", verbose=False):
         """Initialize the camera explorer with path for output files"""
         self.output_dir = output_dir
         self.verbose = verbose
         self.camera = None
+        self.session = None
+        
+        # Property/command descriptions, cached per rec-mode session
+        self._props_cache = None
+        self._commands_cache = None
+        self._keyword_cache = None
         self.log(f"Initializing Camera Explorer with output to: {output_dir}")
         
         # Create output directory if it doesn't exist
@@ -36,6 +67,8 @@ class CameraExplorer:
         """Connect to the camera and retrieve initial information"""
         try:
             self.log("Connecting to camera...")
+            # Reuse one keep-alive connection for every camera request
+            self.session = install_session()
             self.camera = OlympusCamera()
             self.log(f"Connected to {self.camera.get_camera_model()}")
             return True
@@ -43,21 +76,64 @@ class CameraExplorer:
             print(f"Error connecting to camera: {e}")
             return False
     
-    def save_json(self, data, filename):
-        """Save data as JSON to the specified file"""
-        path = os.path.join(self.output_dir, filename)
+    def _get_props(self):
+        """Return settable properties and their values, cached until the next mode switch"""
+        if self._props_cache is None:
+            self._props_cache = self.camera.get_settable_propnames_and_values()
+        return self._props_cache
+    
+    def _get_commands(self):
+        """Return available commands, cached until the next mode switch"""
+        if self._commands_cache is None:
+            self._commands_cache = self.camera.get_commands()
+        return self._commands_cache
+    
+    def _classify(self):
+        """Tag every property and command name with the keywords it contains, in one pass"""
+        if self._keyword_cache is None:
+            self._keyword_cache = {
+                kind: [(name, frozenset(_KEYWORDS.findall(name.lower()))) for name in names]
+                for kind, names in (("props", self._get_props()), ("commands", self._get_commands()))
+            }
+        return self._keyword_cache
+    
+    def _matching(self, kind, *keywords):
+        """Return the property or command names containing any of the keywords"""
+        return [name for name, tags in self._classify()[kind] if not tags.isdisjoint(keywords)]
+    
+    def explore_all(self):
+        """
+        Run the magnification, live view and focus explorations in turn
+        
+        The magnification step switches camera mode and fires zoom commands,
+        so nothing else should talk to the camera while it runs.
+        """
+        return [self.explore_magnification(),
+                self.explore_liveview_options(),
+                self.explore_focus_options()]
+    
+    def save_json(self, data, filename, output_dir=None):
+        """Save data as JSON to the specified file, in output_dir or the default output directory"""
+        path = os.path.join(output_dir or self.output_dir, filename)
         try:
-            with open(path, 'w') as f:
-                json.dump(data, f, indent=2, sort_keys=True)
+            # Sets and other iterables the encoders don't know are written as lists
+            if orjson is not None:
+                encoded = orjson.dumps(data, default=list, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+                                       | orjson.OPT_NON_STR_KEYS)
+                with open(path, 'wb') as f:
+                    f.write(encoded)
+            else:
+                with open(path, 'w') as f:
+                    json.dump(data, f, default=list, indent=2, sort_keys=True)
             self.log(f"Saved data to {path}")
             return True
         except Exception as e:
             print(f"Error saving {path}: {e}")
             return False
     
-    def save_text(self, text, filename):
-        """Save text to the specified file"""
-        path = os.path.join(self.output_dir, filename)
+    def save_text(self, text, filename, output_dir=None):
+        """Save text to the specified file, in output_dir or the default output directory"""
+        path = os.path.join(output_dir or self.output_dir, filename)
         try:
             with open(path, 'w') as f:
                 f.write(text)
@@ -73,77 +149,67 @@ class CameraExplorer:
             "model": self.camera.get_camera_model(),
             "info": self.camera.get_camera_info(),
             "versions": self.camera.get_versions(),
-            "supported": list(self.camera.get_supported())
+            "supported": self.camera.get_supported()
         }
         return self.save_json(info, "camera_info.json")
     
     def dump_commands(self):
         """Dump all available commands and their parameters"""
         commands = {}
-        for cmd_name, cmd_descr in self.camera.get_commands().items():
+        for cmd_name, cmd_descr in self._get_commands().items():
             commands[cmd_name] = {
                 "method": cmd_descr.method,
-                "args": self._serialize_args(cmd_descr.args)
+                # Already nested dicts of strings with None leaves, so the
+                # JSON encoder can walk them directly
+                "args": cmd_descr.args
             }
         return self.save_json(commands, "commands.json")
     
-    def _serialize_args(self, args):
-        """Convert command args to serializable format"""
-        if args is None:
-            return None
-            
-        result = {}
-        for key, value in args.items():
-            if value is None:
-                result[key] = None
-            else:
-                result[key] = self._serialize_args(value)
-        return result
-    
-    def dump_properties(self):
+    def dump_properties(self, output_dir=None):
         """Dump all camera properties and their possible values"""
         try:
-            properties = self.camera.get_settable_propnames_and_values()
-            # Convert properties dict to serializable format (lists instead of tuple/set)
-            serializable = {k: list(v) for k, v in properties.items()}
-            return self.save_json(serializable, "properties.json")
+            return self.save_json(self._get_props(), "properties.json", output_dir)
         except Exception as e:
             print(f"Error dumping properties: {e}")
             return False
     
+    def _save_stream(self, response, filename, output_dir=None):
+        """Write a streamed response body to disk in chunks"""
+        with open(os.path.join(output_dir or self.output_dir, filename), 'wb') as f:
+            for chunk in response.iter_content(chunk_size=65536):
+                f.write(chunk)
+    
     def execute_command(self, command, **params):
         """Execute a specific command and save the result"""
         self.log(f"Executing command: {command} with params: {params}")
+        response = None
         try:
-            response = self.camera.send_command(command, **params)
+            # Images and binary dumps go straight to disk without buffering
+            with streaming():
+                response = self.camera.send_command(command, **params)
             
-            # Save response based on content type
-            if 'Content-Type' in response.headers:
-                content_type = response.headers['Content-Type']
-                
-                if content_type == 'text/xml':
-                    # Save XML response as text
-                    self.save_text(response.text, f"response_{command}.xml")
-                elif content_type.startswith('text/'):
-                    # Save other text responses
-                    self.save_text(response.text, f"response_{command}.txt")
-                elif content_type.startswith('image/'):
-                    # Save binary image data
-                    with open(os.path.join(self.output_dir, f"response_{command}.jpg"), 'wb') as f:
-                        f.write(response.content)
-                else:
-                    # Save other binary data
-                    with open(os.path.join(self.output_dir, f"response_{command}.bin"), 'wb') as f:
-                        f.write(response.content)
+            # Save response based on content type; without one, save as text
+            content_type = response.headers.get('Content-Type')
+            if content_type is None:
+                ext, is_text = ".txt", True
             else:
-                # If no content type, save as text
-                self.save_text(response.text, f"response_{command}.txt")
-                
+                ext, is_text = next(((ext, is_text) for prefix, ext, is_text in _RESPONSE_FORMATS
+                                     if content_type.startswith(prefix)), (".bin", False))
+            
+            filename = f"response_{command}{ext}"
+            if is_text:
+                self.save_text(response.text, filename)
+            else:
+                self._save_stream(response, filename)
+            
             self.log(f"Saved response for command {command}")
             return True
         except Exception as e:
             print(f"Error executing command {command}: {e}")
             return False
+        finally:
+            if response is not None:
+                response.close()
     
     def explore_magnification(self):
         """Focus on exploring magnification capabilities"""
@@ -155,28 +221,24 @@ class CameraExplorer:
             self.camera.send_command('switch_cammode', mode='rec')
             
             # Explore zoom-related properties
-            zoom_props = []
-            for prop in self.camera.get_settable_propnames_and_values().keys():
-                if 'zoom' in prop.lower() or 'magnif' in prop.lower():
-                    zoom_props.append(prop)
-                    self.log(f"Found zoom-related property: {prop}")
+            zoom_props = self._matching("props", "zoom", "magnif")
+            for prop in zoom_props:
+                self.log(f"Found zoom-related property: {prop}")
             
             if zoom_props:
                 self.save_json(zoom_props, "zoom_properties.json")
             
             # Look for zoom-related commands
-            zoom_cmds = []
-            for cmd_name, cmd_descr in self.camera.get_commands().items():
-                if 'zoom' in cmd_name.lower():
-                    zoom_cmds.append(cmd_name)
-                    self.log(f"Found zoom-related command: {cmd_name}")
-                    
-                    # Try to execute the command with default values
-                    try:
-                        response = self.camera.send_command(cmd_name)
-                        self.log(f"Executed {cmd_name}: {response.status_code}")
-                    except Exception as e:
-                        self.log(f"Could not execute {cmd_name}: {e}")
+            zoom_cmds = self._matching("commands", "zoom")
+            for cmd_name in zoom_cmds:
+                self.log(f"Found zoom-related command: {cmd_name}")
+                
+                # Try to execute the command with default values
+                try:
+                    response = self.camera.send_command(cmd_name)
+                    self.log(f"Executed {cmd_name}: {response.status_code}")
+                except Exception as e:
+                    self.log(f"Could not execute {cmd_name}: {e}")
             
             if zoom_cmds:
                 self.save_json(zoom_cmds, "zoom_commands.json")
@@ -193,7 +255,7 @@ class CameraExplorer:
             liveview_settings = {}
             
             # Look in switch_cammode rec options for liveview quality
-            commands = self.camera.get_commands()
+            commands = self._get_commands()
             if 'switch_cammode' in commands and commands['switch_cammode'].args:
                 args = commands['switch_cammode'].args
                 if 'mode' in args and 'rec' in args['mode']:
@@ -202,12 +264,7 @@ class CameraExplorer:
                         liveview_settings['qualities'] = list(rec_options['lvqty'].keys())
             
             # Look for live view commands
-            liveview_cmds = []
-            for cmd_name in commands:
-                if 'live' in cmd_name.lower() or 'lv' in cmd_name.lower():
-                    liveview_cmds.append(cmd_name)
-            
-            liveview_settings['commands'] = liveview_cmds
+            liveview_settings['commands'] = self._matching("commands", "live", "lv")
             
             if liveview_settings:
                 self.save_json(liveview_settings, "liveview_options.json")
@@ -221,20 +278,10 @@ class CameraExplorer:
         """Explore available focus control options"""
         try:
             # Look for focus-related properties
-            focus_props = []
-            for prop in self.camera.get_settable_propnames_and_values().keys():
-                if 'focus' in prop.lower() or 'af' in prop.lower():
-                    focus_props.append(prop)
-                    
-            # Look for focus-related commands
-            focus_cmds = []
-            for cmd_name in self.camera.get_commands():
-                if 'focus' in cmd_name.lower() or 'af' in cmd_name.lower():
-                    focus_cmds.append(cmd_name)
-            
             focus_options = {
-                'properties': focus_props,
-                'commands': focus_cmds
+                'properties': self._matching("props", "focus", "af"),
+                # Look for focus-related commands
+                'commands': self._matching("commands", "focus", "af")
             }
             
             if focus_options['properties'] or focus_options['commands']:
@@ -250,12 +297,30 @@ class CameraExplorer:
         try:
             self.log("Switching to recording mode...")
             self.camera.send_command('switch_cammode', mode='rec')
+            self._props_cache = None
+            self._commands_cache = None
+            self._keyword_cache = None
             self.log("Successfully switched to recording mode")
             return True
         except Exception as e:
             print(f"Error switching to recording mode: {e}")
             return False
     
+    def _parse_desclist(self, xml_text):
+        """Map property names to their <desc> elements in a desclist response"""
+        try:
+            root = ElementTree.fromstring(xml_text)
+        except ElementTree.ParseError as e:
+            self.log(f"Could not parse property descriptions: {e}")
+            return {}
+        
+        descriptions = {}
+        for desc in root.iter("desc"):
+            propname = desc.findtext("propname")
+            if propname:
+                descriptions[propname.strip()] = desc
+        return descriptions
+    
     def dump_properties_in_rec_mode(self):
         """Dump camera properties specifically in recording mode"""
         if not self.switch_to_rec_mode():
@@ -265,34 +330,46 @@ class CameraExplorer:
         rec_dir = os.path.join(self.output_dir, "rec_mode")
         if not os.path.exists(rec_dir):
             os.makedirs(rec_dir)
-            
-        old_output_dir = self.output_dir
-        self.output_dir = rec_dir
         
         # Get all camera properties in rec mode
-        result = self.dump_properties()
+        result = self.dump_properties(rec_dir)
         
         # Get detailed property descriptions
         try:
             self.log("Getting detailed property descriptions in rec mode...")
             response = self.camera.send_command("get_camprop", com="desc", propname="desclist")
             if response:
-                self.save_text(response.text, "property_descriptions.xml")
+                self.save_text(response.text, "property_descriptions.xml", rec_dir)
                 
-                # Also get individual property values
-                properties = self.camera.get_settable_propnames_and_values()
-                for prop_name in properties.keys():
-                    try:
-                        prop_response = self.camera.send_command("get_camprop", com="get", propname=prop_name)
-                        if prop_response:
-                            self.save_text(prop_response.text, f"property_{prop_name}_value.xml")
-                    except Exception as e:
-                        self.log(f"Error getting property {prop_name}: {e}")
+                # Individual property values come from the desclist we already
+                # have; only properties missing from it are queried one by one
+                descriptions = self._parse_desclist(response.text)
+                missing = []
+                for prop_name in self._get_props().keys():
+                    if prop_name in descriptions:
+                        self.save_text(ElementTree.tostring(descriptions[prop_name], encoding="unicode"),
+                                       f"property_{prop_name}_value.xml", rec_dir)
+                    else:
+                        missing.append(prop_name)
+                
+                if missing:
+                    with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+                        futures = {
+                            executor.submit(self.camera.send_command, "get_camprop",
+                                            com="get", propname=prop_name): prop_name
+                            for prop_name in missing
+                        }
+                        for future in as_completed(futures):
+                            prop_name = futures[future]
+                            try:
+                                prop_response = future.result()
+                                if prop_response:
+                                    self.save_text(prop_response.text, f"property_{prop_name}_value.xml", rec_dir)
+                            except Exception as e:
+                                self.log(f"Error getting property {prop_name}: {e}")
         except Exception as e:
             print(f"Error getting property descriptions: {e}")
-            
-        # Restore original output directory
-        self.output_dir = old_output_dir
+        
         return result
         
     def run_exploration(self):
@@ -312,9 +389,7 @@ class CameraExplorer:
         
         # Specific explorations in recording mode
         if self.switch_to_rec_mode():
-            self.explore_magnification()
-            self.explore_liveview_options()
-            self.explore_focus_options()
+            self.explore_all()
             
             # Try execute recording-mode specific commands
             rec_commands_to_try = [
@@ -344,31 +419,31 @@ class CameraExplorer:
                 self.execute_command("exec_takemisc", com="ctrlzoom", move="telemove")
                 
                 # Try to find MF assist functionality (which often includes magnification)
-                for prop in self.camera.get_settable_propnames_and_values().keys():
-                    if "assist" in prop.lower() or "magnif" in prop.lower():
-                        possible_values = self.camera.get_settable_propnames_and_values()[prop]
-                        self.log(f"Found potential magnification property: {prop} with values: {possible_values}")
-                        
-                        # Try setting each value
-                        original_value = self.camera.get_camprop(prop)
-                        magnify_results = {"property": prop, "original_value": original_value, "results": {}}
-                        
-                        for value in possible_values:
-                            try:
-                                self.log(f"Setting {prop} to {value}...")
-                                self.camera.set_camprop(prop, value)
-                                magnify_results["results"][value] = "success"
-                            except Exception as e:
-                                self.log(f"Error setting {prop} to {value}: {e}")
-                                magnify_results["results"][value] = f"error: {str(e)}"
-                                
-                        # Restore original value
+                props = self._get_props()
+                for prop in self._matching("props", "assist", "magnif"):
+                    possible_values = props[prop]
+                    self.log(f"Found potential magnification property: {prop} with values: {possible_values}")
+                    
+                    # Try setting each value
+                    original_value = self.camera.get_camprop(prop)
+                    magnify_results = {"property": prop, "original_value": original_value, "results": {}}
+                    
+                    for value in possible_values:
                         try:
-                            self.camera.set_camprop(prop, original_value)
-                        except:
-                            pass
+                            self.log(f"Setting {prop} to {value}...")
+                            self.camera.set_camprop(prop, value)
+                            magnify_results["results"][value] = "success"
+                        except Exception as e:
+                            self.log(f"Error setting {prop} to {value}: {e}")
+                            magnify_results["results"][value] = f"error: {str(e)}"
                             
-                        self.save_json(magnify_results, "magnification_tests.json")
+                    # Restore original value
+                    try:
+                        self.camera.set_camprop(prop, original_value)
+                    except:
+                        pass
+                        
+                    self.save_json(magnify_results, "magnification_tests.json")
             except Exception as e:
                 self.log(f"Error during detailed magnification exploration: {e}")
         
@@ -425,9 +500,7 @@ def main():
             explorer.dump_camera_info()
             explorer.dump_commands()
             explorer.dump_properties_in_rec_mode()
-            explorer.explore_magnification()
-            explorer.explore_liveview_options()
-            explorer.explore_focus_options()
+            explorer.explore_all()
         else:
             # Run full exploration
             explorer.run_exploration()
@@ -2,13 +2,34 @@
 """
 Test script exploring focus assist functionality which might enable magnification.
 """
+import re
 import time
 import sys
 from olympuswifi.camera import OlympusCamera
 
+from _camsession import install_session
+
+# Property name fragments that hint at focus assist or magnification
+_TAGS = re.compile(r"focus|magnif|assist|mf|zoom")
+
+def _wait_for_prop(camera, prop, target, timeout=3.0, poll=0.1):
+    """Poll a property until the camera reports the target value, up to timeout seconds"""
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        try:
+            if camera.get_camprop(prop) == target:
+                return True
+        except Exception:
+            pass
+        time.sleep(poll)
+    return False
+
 def main():
+    session = None
     try:
         print("Connecting to camera...")
+        # Reuse one keep-alive connection for every camera request
+        session = install_session()
         camera = OlympusCamera()
         print(f"Connected to {camera.get_camera_model()}")
         
@@ -53,9 +74,7 @@ def main():
         focus_props = []
         
         for prop_name in properties:
-            if ('focus' in prop_name.lower() or 'magnif' in prop_name.lower() or 
-                'assist' in prop_name.lower() or 'mf' in prop_name.lower() or
-                'zoom' in prop_name.lower()):
+            if _TAGS.search(prop_name.lower()):
                 focus_props.append(prop_name)
                 print(f"Found focus property: {prop_name} = {properties[prop_name]}")
                 
@@ -88,7 +107,9 @@ def main():
                             try:
                                 camera.set_camprop(prop, value)
                                 print("Success!")
-                                time.sleep(3)  # Let it take effect
+                                # Let it take effect
+                                if not _wait_for_prop(camera, prop, value):
+                                    print(f"{prop} did not report {value} within 3s")
                                 
                                 # Reset to original value
                                 print(f"Resetting {prop} to {current}...")
@@ -124,15 +145,16 @@ def main():
         print("\nTesting supermacromfinaflock...")
         moves = ['near', 'far', 'nearstep', 'farstep', 'stop']
         for move in moves:
-            try:
-                # Try different movement values
-                for movement in ["1", "5", "10", "20"]:
-                    print(f"Testing move={move}, movement={movement}...")
+            # Try different movement values
+            for movement in ["1", "5", "10", "20"]:
+                print(f"Testing move={move}, movement={movement}...")
+                try:
                     response = camera.send_command('exec_takemisc', com='supermacromfinaflock', move=move, movement=movement)
                     print(f"Response: {response.status_code}")
+                    # Let the lens finish moving; there is nothing to poll for it
                     time.sleep(1)
-            except Exception as e:
-                print(f"Error with {move}: {e}")
+                except Exception as e:
+                    print(f"Error with {move}: {e}")
                 
         # 3. Test focus-related commands
         print("\nTesting focus commands...")
@@ -179,6 +201,9 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        if session:
+            session.close()
 
 
 if __name__ == "__main__":
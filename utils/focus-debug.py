@@ -4,21 +4,26 @@ Debug script for exploring focus control with error 1004 handling.
 """
 import time
 import sys
-from olympuswifi.camera import OlympusCamera, RequestError, ResultError
+from olympuswifi.camera import RequestError, ResultError
+
+from _camera_daemon import get_camera
+from _camsession import install_session, send_command_noresp, pipeline, CameraError, MISSING_PARAMETER
+from _prewarm import prewarm
+
+# Property name fragments that hint at manual focus assist or magnification
+_MF_KEYWORDS = ('mf', 'magnif', 'assist', 'zoom')
 
 
 def main():
+    session = None
     try:
         print("Connecting to camera...")
-        camera = OlympusCamera()
+        prewarm()
+        session = install_session()
+        camera = get_camera()
         print(f"Connected to {camera.get_camera_model()}")
         
-        # Check camera mode and switch to rec mode
-        print("Switching to recording mode...")
-        camera.send_command('switch_cammode', mode='rec', lvqty="0640x0480")
-        time.sleep(1)  # Give camera time to switch
-        
-        # Start live view
+        # Start live view; this also switches the camera to rec mode
         print("Starting live view...")
         result = camera.start_liveview(port=40000, lvqty="0640x0480")
         print(f"Live view started with functions: {result}")
@@ -44,13 +49,13 @@ def main():
             print(f"Setting focus point to {point} twice...")
             
             # First tap
-            response = camera.send_command('exec_takemotion', com='assignafframe', point=point)
-            print(f"First tap response: {response.status_code}")
+            status = send_command_noresp(camera, 'exec_takemotion', com='assignafframe', point=point)
+            print(f"First tap response: {status}")
             time.sleep(0.5)
             
             # Second tap on same point
-            response = camera.send_command('exec_takemotion', com='assignafframe', point=point)
-            print(f"Second tap response: {response.status_code}")
+            status = send_command_noresp(camera, 'exec_takemotion', com='assignafframe', point=point)
+            print(f"Second tap response: {status}")
             time.sleep(3)  # Wait to see if magnification occurs
         except Exception as e:
             print(f"Error with double focus point: {e}")
@@ -60,29 +65,41 @@ def main():
         try:
             # Look up available parameters for ctrlzoom
             cmd_desc = camera.commands['exec_takemisc']
+            ctrlzoom_args = {}
             if cmd_desc.args and 'com' in cmd_desc.args:
                 if 'ctrlzoom' in cmd_desc.args['com']:
-                    print(f"ctrlzoom parameters: {cmd_desc.args['com']['ctrlzoom']}")
+                    ctrlzoom_args = cmd_desc.args['com']['ctrlzoom'] or {}
+                    print(f"ctrlzoom parameters: {ctrlzoom_args}")
+            
+            # Moves the camera lists for ctrlzoom; empty if it doesn't say,
+            # and a '*' wildcard means any move is accepted
+            valid_moves = set(ctrlzoom_args.get('move') or {})
+            if '*' in valid_moves:
+                valid_moves = set()
             
             # Try with move parameter   
             print("Trying 'exec_takemisc' with 'ctrlzoom'...")
             
             # Try with different moves
             moves = ['telemove', 'widemove', 'off', 'wideterm', 'teleterm']
+            if valid_moves:
+                moves = [move for move in moves if move in valid_moves]
             for move in moves:
                 try:
                     print(f"Testing move='{move}'...")
-                    response = camera.send_command('exec_takemisc', com='ctrlzoom', move=move)
-                    print(f"Response for {move}: {response.status_code}")
+                    status = send_command_noresp(camera, 'exec_takemisc', com='ctrlzoom', move=move)
+                    print(f"Response for {move}: {status}")
                     time.sleep(1)
-                except Exception as e:
-                    error_str = str(e)
-                    if "1004" in error_str:
+                except CameraError as e:
+                    if e.code == MISSING_PARAMETER:
                         print(f"Error 1004 (missing parameter) for {move}")
                         # Try to analyze what parameter might be missing
                         print(f"We sent: com=ctrlzoom, move={move}")
-                    else:
-                        print(f"Error with {move}: {e}")
+                        # The other moves are missing the same parameter
+                        break
+                    print(f"Error {e.code} with {move}: {e}")
+                except Exception as e:
+                    print(f"Error with {move}: {e}")
         except Exception as e:
             print(f"Error with ctrlzoom test: {e}")
         
@@ -91,7 +108,8 @@ def main():
         try:
             properties = camera.get_settable_propnames_and_values()
             for prop_name in properties.keys():
-                if 'mf' in prop_name.lower() or 'magnif' in prop_name.lower() or 'assist' in prop_name.lower() or 'zoom' in prop_name.lower():
+                name_lc = prop_name.lower()
+                if any(keyword in name_lc for keyword in _MF_KEYWORDS):
                     print(f"Found property: {prop_name} = {properties[prop_name]}")
                     try:
                         # Get current value
@@ -105,14 +123,13 @@ def main():
         # Fifth test: Manual focus point on then off to try to trigger magnification
         print("\n--- Testing MF point assignment then release ---")
         try:
-            # Assign focus point
-            response = camera.send_command('exec_takemotion', com='assignafframe', point="50:50")
-            print(f"Assign response: {response.status_code}")
-            time.sleep(1)
-            
-            # Release focus point
-            response = camera.send_command('exec_takemotion', com='releaseafframe')
-            print(f"Release response: {response.status_code}")
+            # Assign focus point and release it, sent back to back
+            assign_status, release_status = pipeline(camera, [
+                ('exec_takemotion', {'com': 'assignafframe', 'point': "50:50"}),
+                ('exec_takemotion', {'com': 'releaseafframe'}),
+            ])
+            print(f"Assign response: {assign_status}")
+            print(f"Release response: {release_status}")
             time.sleep(1)
         except Exception as e:
             print(f"Error with assign/release test: {e}")
@@ -121,14 +138,14 @@ def main():
         print("\n--- Testing other focus methods ---")
         try:
             # Try takeready
-            response = camera.send_command('exec_takemotion', com='takeready', point="50:50")
-            print(f"takeready response: {response.status_code}")
+            status = send_command_noresp(camera, 'exec_takemotion', com='takeready', point="50:50")
+            print(f"takeready response: {status}")
             time.sleep(1)
             
             # Try starttake
             try:
-                response = camera.send_command('exec_takemotion', com='starttake', point="50:50")
-                print(f"starttake response: {response.status_code}")
+                status = send_command_noresp(camera, 'exec_takemotion', com='starttake', point="50:50")
+                print(f"starttake response: {status}")
                 time.sleep(1)
             except Exception as e:
                 print(f"Error with starttake: {e}")
@@ -145,6 +162,9 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        if session:
+            session.close()
 
 
 if __name__ == "__main__":
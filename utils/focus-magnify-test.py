@@ -3,9 +3,19 @@
 Test script for exploring focus control and magnification features
 of the Olympus E-M5 Mark III camera.
 """
+import argparse
+import logging
 import time
 import sys
-from olympuswifi.camera import OlympusCamera
+
+from _camera_daemon import get_camera
+from _camsession import install_session, send_command_noresp
+from _prewarm import prewarm
+
+logger = logging.getLogger("FocusMagnify")
+
+# "x:y" point strings for the 5% grid the tests use
+_POINT_CACHE = {(x, y): f"{x}:{y}" for x in range(0, 101, 5) for y in range(0, 101, 5)}
 
 
 class FocusMagnifyTester:
@@ -14,35 +24,33 @@ class FocusMagnifyTester:
     of Olympus cameras.
     """
     
-    def __init__(self, verbose=True):
+    def __init__(self):
         """Initialize the tester with camera connection"""
-        self.verbose = verbose
         self.camera = None
+        self.session = None
         self.connection_successful = False
         self.log("Initializing FocusMagnifyTester")
     
-    def log(self, message):
-        """Log messages if verbose mode is enabled"""
-        if self.verbose:
-            print(message)
+    def log(self, message, *args):
+        """Log messages if verbose mode is enabled; args are only formatted when shown"""
+        logger.debug(message, *args)
     
     def connect(self):
         """Connect to the camera and verify recording mode"""
         try:
             self.log("Connecting to camera...")
-            self.camera = OlympusCamera()
+            prewarm()
+            # Reuse one keep-alive connection for every camera request
+            self.session = install_session()
+            self.camera = get_camera()
             model = self.camera.get_camera_model()
-            self.log(f"Connected to {model}")
+            self.log("Connected to %s", model)
             self.connection_successful = True
             
-            # Switch to recording mode
-            self.log("Switching to recording mode...")
-            self.camera.send_command('switch_cammode', mode='rec')
-            
-            # Start live view on port 40000
+            # Start live view on port 40000; this also switches to rec mode
             self.log("Starting live view...")
             result = self.camera.start_liveview(port=40000, lvqty="0640x0480")
-            self.log(f"Live view started: {result}")
+            self.log("Live view started: %s", result)
             
             return True
         except Exception as e:
@@ -62,15 +70,15 @@ class FocusMagnifyTester:
             x = max(0, min(100, x))
             y = max(0, min(100, y))
             
-            point_param = f"{x}:{y}"
-            self.log(f"Setting focus point to {point_param}...")
+            point_param = _POINT_CACHE.get((x, y)) or f"{x}:{y}"
+            self.log("Setting focus point to %s...", point_param)
             
             # First try assignafframe
             try:
-                response = self.camera.send_command('exec_takemotion', com='assignafframe', point=point_param)
-                self.log(f"Focus point set response: {response.status_code}")
+                status = send_command_noresp(self.camera, 'exec_takemotion', com='assignafframe', point=point_param)
+                self.log("Focus point set response: %s", status)
             except Exception as e:
-                self.log(f"Error setting focus point: {e}")
+                self.log("Error setting focus point: %s", e)
             
             # Wait a moment for the camera to process
             time.sleep(0.5)
@@ -81,6 +89,22 @@ class FocusMagnifyTester:
             print(f"Error setting focus point: {e}")
             return False
     
+    def sweep_focus_points(self, points):
+        """
+        Set each focus point in turn, pausing so the effect can be seen
+        
+        Args:
+            points: List of (x, y) coordinates (0-100)
+        """
+        results = []
+        for x, y in points:
+            print(f"\n--- Testing focus point ({x}, {y}) ---")
+            results.append(self.test_focus_point(x, y))
+            # Wait to see the effect
+            time.sleep(2)
+        
+        return all(results)
+    
     def test_magnify(self, action):
         """
         Test magnification features
@@ -94,46 +118,46 @@ class FocusMagnifyTester:
                 # 1. First try ctrlzoom with telemove
                 self.log("Starting magnification with telemove...")
                 try:
-                    response = self.camera.send_command('exec_takemisc', com='ctrlzoom', move='telemove')
-                    self.log(f"Magnification start response: {response.status_code}")
+                    status = send_command_noresp(self.camera, 'exec_takemisc', com='ctrlzoom', move='telemove')
+                    self.log("Magnification start response: %s", status)
                 except Exception as e:
-                    self.log(f"Error with telemove: {e}")
+                    self.log("Error with telemove: %s", e)
                 
             elif action == 'stop':
                 # Try to stop magnification
                 self.log("Stopping magnification...")
                 try:
-                    response = self.camera.send_command('exec_takemisc', com='ctrlzoom', move='off')
-                    self.log(f"Magnification stop response: {response.status_code}")
+                    status = send_command_noresp(self.camera, 'exec_takemisc', com='ctrlzoom', move='off')
+                    self.log("Magnification stop response: %s", status)
                 except Exception as e:
-                    self.log(f"Error stopping magnification: {e}")
+                    self.log("Error stopping magnification: %s", e)
                 
             elif action == 'in':
                 # Zoom in further
                 self.log("Zooming in further...")
                 try:
-                    response = self.camera.send_command('exec_takemisc', com='ctrlzoom', move='telemove')
-                    self.log(f"Zoom in response: {response.status_code}")
+                    status = send_command_noresp(self.camera, 'exec_takemisc', com='ctrlzoom', move='telemove')
+                    self.log("Zoom in response: %s", status)
                 except Exception as e:
-                    self.log(f"Error zooming in: {e}")
+                    self.log("Error zooming in: %s", e)
                 
             elif action == 'out':
                 # Zoom out
                 self.log("Zooming out...")
                 try:
-                    response = self.camera.send_command('exec_takemisc', com='ctrlzoom', move='widemove')
-                    self.log(f"Zoom out response: {response.status_code}")
+                    status = send_command_noresp(self.camera, 'exec_takemisc', com='ctrlzoom', move='widemove')
+                    self.log("Zoom out response: %s", status)
                 except Exception as e:
-                    self.log(f"Error zooming out: {e}")
+                    self.log("Error zooming out: %s", e)
             
             # Handle movement within a magnified view
             elif action.startswith('move-'):
                 # We'd need to know how to move within a magnified view
                 # This would be camera-specific
-                self.log(f"Movement action {action} not yet implemented")
+                self.log("Movement action %s not yet implemented", action)
                 
             else:
-                self.log(f"Unknown magnification action: {action}")
+                self.log("Unknown magnification action: %s", action)
                 return False
                 
             # Wait for camera to process
@@ -160,10 +184,20 @@ class FocusMagnifyTester:
             self.log("Test complete")
         except Exception as e:
             print(f"Error during cleanup: {e}")
+        finally:
+            if self.session:
+                self.session.close()
 
 
 def main():
     """Main function to run the tests"""
+    parser = argparse.ArgumentParser(description="Test focus point and magnification control")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Only print test headers and errors")
+    args = parser.parse_args()
+    
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    logger.setLevel(logging.WARNING if args.quiet else logging.DEBUG)
     tester = FocusMagnifyTester()
     
     if not tester.connect():
@@ -183,11 +217,7 @@ def main():
             (75, 75),  # Bottom right
         ]
         
-        for x, y in points_to_test:
-            print(f"\n--- Testing focus point ({x}, {y}) ---")
-            tester.test_focus_point(x, y)
-            # Wait to see the effect
-            time.sleep(2)
+        tester.sweep_focus_points(points_to_test)
         
         # Test magnification
         print("\n--- Testing magnification ---")
@@ -10,7 +10,19 @@ This implements the specific sequence:
 import time
 import sys
 import argparse
-from olympuswifi.camera import OlympusCamera
+
+from _camera_daemon import get_camera
+from _camsession import install_session, send_command_noresp, prepare_command, send_prepared, pipeline
+from _prewarm import prewarm
+
+
+def _accepted(result):
+    """Return True if a method's status code(s) show the camera accepted it"""
+    if isinstance(result, int):
+        return result in (200, 202)
+    if isinstance(result, list):
+        return bool(result) and all(_accepted(status) for status in result)
+    return False
 
 
 def main():
@@ -24,15 +36,18 @@ def main():
                        help="Delay between focus actions (seconds)")
     args = parser.parse_args()
     
+    session = None
     try:
         # Connect to camera
         print("Connecting to camera...")
-        camera = OlympusCamera()
+        prewarm()
+        session = install_session()
+        camera = get_camera()
         print(f"Connected to {camera.get_camera_model()}")
         
         # Switch to recording mode
         print("Switching to recording mode...")
-        camera.send_command('switch_cammode', mode='rec')
+        send_command_noresp(camera, 'switch_cammode', mode='rec')
         
         # Start live view if requested
         if args.live_view:
@@ -45,42 +60,53 @@ def main():
         x = max(0, min(100, args.x))
         y = max(0, min(100, args.y))
         point_param = f"{x}:{y}"
+        properties = camera.get_settable_propnames_and_values()
+        has_mf_assist = "MF_ASSIST" in properties
+        
+        # Build the focus commands once; every step resends the same request
+        assign_request = prepare_command(session, camera, 'exec_takemotion', com='assignafframe', point=point_param)
+        takeready_request = prepare_command(session, camera, 'exec_takemotion', com='takeready', point=point_param)
         
         # Try different methods for setting focus point
         methods = [
             # Method 1: Use assignafframe to set focus point
-            lambda: camera.send_command('exec_takemotion', com='assignafframe', point=point_param),
+            lambda: send_prepared(session, assign_request),
             
             # Method 2: Use takeready to prepare focus point
-            lambda: camera.send_command('exec_takemotion', com='takeready', point=point_param),
+            lambda: send_prepared(session, takeready_request),
             
             # Method 3: Try both in sequence (some cameras need this)
-            lambda: (
-                camera.send_command('exec_takemotion', com='assignafframe', point=point_param),
-                time.sleep(0.2),
-                camera.send_command('exec_takemotion', com='takeready', point=point_param)
-            ),
+            lambda: pipeline(camera, [
+                ('exec_takemotion', {'com': 'assignafframe', 'point': point_param}),
+                ('exec_takemotion', {'com': 'takeready', 'point': point_param}),
+            ]),
             
             # Method 4: Additional try with MF assist function (if available)
             # This is camera specific and might need to be adjusted
-            lambda: camera.set_camprop("MF_ASSIST", "ON") if "MF_ASSIST" in camera.get_settable_propnames_and_values() else None
+            lambda: camera.set_camprop("MF_ASSIST", "ON") if has_mf_assist else None
         ]
         
         # Test setting focus points multiple times
         print(f"Setting focus point at ({x}, {y}) {args.steps} times...")
         
-        # Try each method
+        # Try each method until one is accepted by the camera
+        success = False
         for method_idx, method in enumerate(methods):
             print(f"Trying method {method_idx + 1}...")
             try:
                 # Execute each step the requested number of times
+                all_accepted = True
                 for step in range(args.steps):
+                    # Only back off once the camera has turned a step down
+                    if step and not all_accepted:
+                        time.sleep(args.delay)
                     print(f"Step {step + 1}/{args.steps}...")
                     result = method()
-                    # If the method returned a result and it wasn't successful, print it
-                    if result and hasattr(result, 'status_code') and result.status_code != 200:
-                        print(f"Warning: Status code {result.status_code}")
-                    time.sleep(args.delay)
+                    if not _accepted(result):
+                        all_accepted = False
+                    # If the method returned a status code and it wasn't successful, print it
+                    if isinstance(result, int) and result != 200:
+                        print(f"Warning: Status code {result}")
                 
                 # Try different magnification methods after setting focus point
                 print("Attempting magnification controls...")
@@ -88,43 +114,46 @@ def main():
                 # Method 1: Using ctrlzoom
                 try:
                     print("Testing telemove magnification...")
-                    camera.send_command('exec_takemisc', com='ctrlzoom', move='telemove')
+                    send_command_noresp(camera, 'exec_takemisc', com='ctrlzoom', move='telemove')
                     time.sleep(2)  # Wait to see the effect
-                    camera.send_command('exec_takemisc', com='ctrlzoom', move='off')
+                    send_command_noresp(camera, 'exec_takemisc', com='ctrlzoom', move='off')
                 except Exception as e:
                     print(f"telemove failed: {e}")
                 
+                if all_accepted:
+                    success = True
+                    break
+                
                 time.sleep(1)
                 
             except Exception as e:
                 print(f"Method {method_idx + 1} failed: {e}")
         
-        # Some additional experiments with the manual focus assist feature
-        try:
-            print("\nTesting alternate magnification approaches...")
-            
-            # Try to check for manual focus assist (MF Mode or similar)
-            all_props = camera.get_settable_propnames_and_values()
-            
-            # Look for MF related properties
-            mf_props = [prop for prop in all_props.keys() if 'mf' in prop.lower()]
-            
-            if mf_props:
-                print(f"Found MF-related properties: {mf_props}")
-                for prop in mf_props:
-                    print(f"Values for {prop}: {all_props[prop]}")
-                    
-                    # Try to enable any MF assist features
-                    for value in all_props[prop]:
-                        if 'on' in value.lower() or 'enabled' in value.lower():
-                            try:
-                                print(f"Setting {prop} to {value}...")
-                                camera.set_camprop(prop, value)
-                                time.sleep(2)  # Wait to see effect
-                            except Exception as e:
-                                print(f"Failed to set {prop} to {value}: {e}")
-        except Exception as e:
-            print(f"Error testing MF properties: {e}")
+        # Some additional experiments with the manual focus assist feature,
+        # only needed when no focus method was accepted
+        if not success:
+            try:
+                print("\nTesting alternate magnification approaches...")
+                
+                # Look for MF related properties, such as MF Mode or MF assist
+                mf_props = [prop for prop in properties.keys() if 'mf' in prop.lower()]
+                
+                if mf_props:
+                    print(f"Found MF-related properties: {mf_props}")
+                    for prop in mf_props:
+                        print(f"Values for {prop}: {properties[prop]}")
+                        
+                        # Try to enable any MF assist features
+                        for value in properties[prop]:
+                            if 'on' in value.lower() or 'enabled' in value.lower():
+                                try:
+                                    print(f"Setting {prop} to {value}...")
+                                    camera.set_camprop(prop, value)
+                                    time.sleep(2)  # Wait to see effect
+                                except Exception as e:
+                                    print(f"Failed to set {prop} to {value}: {e}")
+            except Exception as e:
+                print(f"Error testing MF properties: {e}")
         
         # Clean up
         if args.live_view:
@@ -137,6 +166,9 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        if session:
+            session.close()
 
 
 if __name__ == "__main__":
@@ -4,20 +4,22 @@ Test script for trying specific command sequences for magnification.
 """
 import time
 import sys
-from olympuswifi.camera import OlympusCamera
+from olympuswifi.camera import RequestError
+
+from _camera_daemon import get_camera
+from _camsession import install_session, send_command_noresp
+from _prewarm import prewarm
 
 def main():
+    session = None
     try:
         print("Connecting to camera...")
-        camera = OlympusCamera()
+        prewarm()
+        session = install_session()
+        camera = get_camera()
         print(f"Connected to {camera.get_camera_model()}")
         
-        # Switch to recording mode
-        print("Switching to recording mode...")
-        camera.send_command('switch_cammode', mode='rec', lvqty="0640x0480")
-        time.sleep(1)
-        
-        # Start live view
+        # Start live view; this also switches the camera to rec mode
         print("Starting live view...")
         camera.start_liveview(port=40000, lvqty="0640x0480")
         time.sleep(1)
@@ -28,13 +30,13 @@ def main():
         try:
             # Set focus point
             print("Setting focus point...")
-            camera.send_command('exec_takemotion', com='assignafframe', point="50:50")
+            send_command_noresp(camera, 'exec_takemotion', com='assignafframe', point="50:50")
             time.sleep(1)
             
             # Try zoom
             print("Trying zoom...")
             try:
-                camera.send_command('exec_takemisc', com='ctrlzoom', move='telemove')
+                send_command_noresp(camera, 'exec_takemisc', com='ctrlzoom', move='telemove')
                 print("Zoom command succeeded!")
             except Exception as e:
                 print(f"Zoom failed: {e}")
@@ -45,13 +47,13 @@ def main():
         try:
             # Set focus point with takeready
             print("Setting focus with takeready...")
-            camera.send_command('exec_takemotion', com='takeready', point="50:50")
+            send_command_noresp(camera, 'exec_takemotion', com='takeready', point="50:50")
             time.sleep(1)
             
             # Try zoom
             print("Trying zoom...")
             try:
-                camera.send_command('exec_takemisc', com='ctrlzoom', move='telemove')
+                send_command_noresp(camera, 'exec_takemisc', com='ctrlzoom', move='telemove')
                 print("Zoom command succeeded!")
             except Exception as e:
                 print(f"Zoom failed: {e}")
@@ -64,7 +66,7 @@ def main():
             for value in ['1', '2', '3', '10', '100']:
                 print(f"Trying telemove with movement={value}...")
                 try:
-                    camera.send_command('exec_takemisc', com='ctrlzoom', move='telemove', movement=value)
+                    send_command_noresp(camera, 'exec_takemisc', com='ctrlzoom', move='telemove', movement=value)
                     print("Zoom command succeeded!")
                     break
                 except Exception as e:
@@ -75,7 +77,7 @@ def main():
         # Try to cancel zoom
         print("\nTurning off zoom...")
         try:
-            camera.send_command('exec_takemisc', com='ctrlzoom', move='off')
+            send_command_noresp(camera, 'exec_takemisc', com='ctrlzoom', move='off')
             print("Zoom off succeeded")
         except Exception as e:
             print(f"Zoom off failed: {e}")
@@ -93,19 +95,17 @@ def main():
                 for value in values:
                     print(f"Trying telemove with {param}={value}...")
                     try:
-                        # Create params dict dynamically
-                        extra_params = {'com': 'ctrlzoom', 'move': 'telemove', param: value}
-                        camera.send_command('exec_takemisc', **extra_params)
+                        send_command_noresp(camera, 'exec_takemisc', com='ctrlzoom', move='telemove', **{param: value})
                         print(f"Success with {param}={value}!")
                         
                         # Try to turn off zoom
-                        camera.send_command('exec_takemisc', com='ctrlzoom', move='off')
+                        send_command_noresp(camera, 'exec_takemisc', com='ctrlzoom', move='off')
                         break  # Found a working param, stop trying
+                    except RequestError:
+                        # Rejected by the command list before anything was sent
+                        print(f"Parameter '{param}' not supported")
                     except Exception as e:
-                        if 'not supported' in str(e):
-                            print(f"Parameter '{param}' not supported")
-                        else:
-                            print(f"Failed: {e}")
+                        print(f"Failed: {e}")
         except Exception as e:
             print(f"Sequence 4 error: {e}")
             
@@ -124,7 +124,7 @@ def main():
                 for flag in flags:
                     try:
                         print(f"Trying with {flag}=on...")
-                        camera.send_command('exec_takemisc', com='startliveview', port=40000, **{flag: 'on'})
+                        send_command_noresp(camera, 'exec_takemisc', com='startliveview', port=40000, **{flag: 'on'})
                         print(f"Success with {flag}=on")
                     except Exception as e:
                         print(f"Failed with {flag}: {e}")
@@ -152,6 +152,9 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        if session:
+            session.close()
 
 
 if __name__ == "__main__":
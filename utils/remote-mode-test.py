@@ -5,6 +5,7 @@ Test script that handles mode switching between live view and remote shutter.
 import time
 import sys
 import io
+import socket
 import threading
 import queue
 import tkinter as tk
@@ -12,14 +13,137 @@ from PIL import Image, ImageTk
 from olympuswifi.camera import OlympusCamera
 from olympuswifi.liveview import LiveViewReceiver
 
+from _camsession import pipeline
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+except ImportError:
+    # Optional; fall back to PIL's JPEG decoder
+    TurboJPEG = None
+
+
+class SpscFrameRing:
+    """
+    Bounded single-producer, single-consumer frame queue.
+    
+    The receiver thread only advances tail and the Tk thread only advances
+    head, so neither side takes a lock; the GIL orders the slot write before
+    the index update. When the ring is full new frames are dropped until the
+    consumer catches up. on_put, if set, is called after each frame is added.
+    
+    Provides the subset of the queue.Queue interface LiveViewReceiver uses.
+    """
+    
+    def __init__(self, size=8):
+        """
+        Args:
+            size: Number of slots, a power of two; one slot is kept free
+        """
+        assert size & (size - 1) == 0, "size must be a power of two"
+        self.buf = [None] * size
+        self.mask = size - 1
+        self.head = 0  # Next slot to read, written by the consumer only
+        self.tail = 0  # Next slot to write, written by the producer only
+        self.on_put = None
+    
+    def put(self, frame):
+        """Add a frame; returns False and drops it if the ring is full"""
+        tail = self.tail
+        next_tail = (tail + 1) & self.mask
+        if next_tail == self.head:
+            return False
+        self.buf[tail] = frame
+        self.tail = next_tail
+        if self.on_put:
+            self.on_put()
+        return True
+    
+    def get_nowait(self):
+        """Remove and return the oldest frame, raising queue.Empty if there is none"""
+        head = self.head
+        if head == self.tail:
+            raise queue.Empty
+        frame = self.buf[head]
+        self.buf[head] = None
+        self.head = (head + 1) & self.mask
+        return frame
+    
+    get = get_nowait
+    
+    def empty(self):
+        return self.head == self.tail
+    
+    def qsize(self):
+        return (self.tail - self.head) & self.mask
+
+
+class TunedLiveViewReceiver(LiveViewReceiver):
+    """LiveViewReceiver whose UDP socket can use a larger kernel receive buffer"""
+    
+    def __init__(self, img_queue, rcvbuf=None):
+        """
+        Args:
+            img_queue: Queue that receives JPEGandExtension frames
+            rcvbuf: SO_RCVBUF size in bytes, or None for the system default
+        """
+        super().__init__(img_queue)
+        self.rcvbuf = rcvbuf
+    
+    def receive_packets(self, port):
+        """Same loop as LiveViewReceiver.receive_packets, with SO_RCVBUF applied before bind"""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            if self.rcvbuf:
+                # Linux silently caps this at net.core.rmem_max
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+            sock.bind(("", port))
+            sock.settimeout(1) # A timeout terminates the loop below.
+            while True:
+                try:
+                    packet = sock.recv(4096)
+                except socket.timeout:
+                    if self.running:
+                        # Not yet shutting down, keep going.
+                        continue
+                    break
+                except OSError as e:
+                    print("Error reading liveview:", str(e))
+                    break
+                self.process_packet(packet)
+
+
 class RemoteModeTest:
+    # How often the Tk thread picks up decoded frames while live view runs;
+    # one live view frame interval (~30 fps), so no faster than frames arrive
+    FRAME_POLL_MS = 33
+    
     def __init__(self):
         self.camera = OlympusCamera()
-        self.img_queue = queue.Queue(maxlen=5)
+        # Three frames of slack: enough to ride out a slow redraw without
+        # the preview trailing the camera
+        self.img_queue = SpscFrameRing(4)
         self.receiver = None
         self.thread = None
         self.running = False
         self.current_mode = None  # 'liveview' or 'shutter'
+        # Preview frames use the fast JPEG draft decode and bilinear scaling;
+        # set to True for LANCZOS-quality scaling of full decodes
+        self.high_quality = False
+        # Live view display is reused from frame to frame
+        self._photo = None
+        self._canvas_item = None
+        self._canvas_size = (0, 0)
+        self._frame_poll = None
+        # Log lines waiting to be added to the log window
+        self._log_pending = []
+        self._log_flush_scheduled = False
+        # JPEG decoding and scaling run on their own thread; the Tk thread
+        # only pastes the finished image
+        self._decoded_q = SpscFrameRing(2)
+        self._frame_ready = threading.Event()
+        self._target_size = (0, 0)
+        self._decoding = True
+        self._turbojpeg = self._load_turbojpeg()
+        self._decode_thread = threading.Thread(target=self._decode_loop, daemon=True)
         
     def setup_ui(self):
         self.root = tk.Tk()
@@ -53,6 +177,8 @@ class RemoteModeTest:
         
         self.canvas = tk.Canvas(self.image_frame, bg="black")
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        # The decode thread scales frames to the size recorded here
+        self.canvas.bind('<Configure>', self._on_canvas_resize)
         
         # Status updates frame
         self.log_frame = tk.Frame(self.root)
@@ -65,8 +191,10 @@ class RemoteModeTest:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.log_text.config(yscrollcommand=scrollbar.set)
         
-        # Start frame checking
-        self.root.after(33, self.check_for_frames)
+        # Received frames wake the decode thread; the Tk thread collects the
+        # decoded frames itself while live view runs
+        self.img_queue.on_put = self._frame_ready.set
+        self._decode_thread.start()
         
         # Configure window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -74,15 +202,23 @@ class RemoteModeTest:
         return self.root
     
     def log(self, message):
-        """Add message to log window"""
-        self.log_text.insert(tk.END, f"{message}\n")
-        self.log_text.see(tk.END)
+        """Add message to log window; lines logged together are inserted in one go"""
+        self._log_pending.append(f"{message}\n")
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.root.after_idle(self._flush_log)
         print(message)
     
+    def _flush_log(self):
+        """Insert the pending log lines and scroll to the end once"""
+        self._log_flush_scheduled = False
+        self.log_text.insert(tk.END, "".join(self._log_pending))
+        self._log_pending.clear()
+        self.log_text.see(tk.END)
+    
     def update_status(self, message):
         """Update status bar"""
         self.status_var.set(message)
-        self.root.update_idletasks()
     
     def start_live_view(self):
         """Start live view mode"""
@@ -91,25 +227,27 @@ class RemoteModeTest:
             return
             
         try:
+            # Repaint now; the camera calls below block the Tk thread
             self.update_status("Switching to recording mode...")
+            self.root.update_idletasks()
             self.camera.send_command('switch_cammode', mode='rec', lvqty="0640x0480")
             time.sleep(1)
             
             self.update_status("Starting live view...")
+            self.root.update_idletasks()
             self.camera.start_liveview(port=40000, lvqty="0640x0480")
             time.sleep(0.5)
             
-            # Clear any existing frames
-            while not self.img_queue.empty():
-                self.img_queue.get_nowait()
-            
             # Start receiver
-            self.receiver = LiveViewReceiver(self.img_queue)
+            # A 4 MB receive buffer rides out Tk stalls without dropping
+            # packets, which would cost the whole frame
+            self.receiver = TunedLiveViewReceiver(self.img_queue, rcvbuf=4 * 1024 * 1024)
             self.thread = threading.Thread(target=self.receiver.receive_packets, args=[40000])
             self.thread.daemon = True
             self.thread.start()
             
             self.running = True
+            self._schedule_frame_poll()
             self.current_mode = 'liveview'
             self.update_status("Live view active")
             self.log("Live view started")
@@ -132,12 +270,14 @@ class RemoteModeTest:
         try:
             if self.running:
                 self.update_status("Stopping live view...")
+                self.root.update_idletasks()
                 self.receiver.shut_down()
                 self.camera.stop_liveview()
                 self.running = False
                 time.sleep(1)
             
             self.update_status("Switching to shutter mode...")
+            self.root.update_idletasks()
             self.camera.send_command('switch_cammode', mode='shutter')
             time.sleep(1)
             
@@ -162,11 +302,14 @@ class RemoteModeTest:
             
         try:
             self.update_status("Taking picture...")
+            self.root.update_idletasks()
             self.log("Sending shutter commands...")
             
             # First press
             self.log("1st press...")
             self.camera.send_command('exec_shutter', com='1stpush')
+            # The camera gives no signal for focus lock or exposure, so
+            # these waits stay fixed
             time.sleep(0.5)
             
             # Second press
@@ -174,11 +317,14 @@ class RemoteModeTest:
             self.camera.send_command('exec_shutter', com='2ndpush')
             time.sleep(1)
             
-            # Release
+            # Release both stages; the order matters but nothing has to
+            # happen in between, so send them back to back
             self.log("Release...")
-            self.camera.send_command('exec_shutter', com='2ndrelease')
-            time.sleep(0.5)
-            self.camera.send_command('exec_shutter', com='1strelease')
+            statuses = pipeline(self.camera, [
+                ('exec_shutter', {'com': '2ndrelease'}),
+                ('exec_shutter', {'com': '1strelease'}),
+            ])
+            self.log(f"Release responses: {statuses}")
             
             self.update_status("Picture taken")
             self.log("Picture captured")
@@ -187,53 +333,147 @@ class RemoteModeTest:
             self.update_status(f"Error: {e}")
             self.log(f"Error taking picture: {e}")
     
-    def check_for_frames(self):
-        """Check for new frames and update display"""
-        if self.running:
+    def _on_canvas_resize(self, event):
+        """Record the canvas size for the decode thread"""
+        self._target_size = (event.width, event.height)
+    
+    def _decode_loop(self):
+        """Decode thread: turn the newest received JPEG into a display-sized image"""
+        while self._decoding:
+            if not self._frame_ready.wait(timeout=0.5):
+                continue
+            self._frame_ready.clear()
+            
+            # Only the newest frame is worth decoding
+            frame = None
             try:
-                if not self.img_queue.empty():
+                while True:
                     frame = self.img_queue.get_nowait()
-                    self.display_frame(frame)
             except queue.Empty:
                 pass
+            
+            # Frames left over from a stopped live view are just dropped
+            if self.running and frame and frame.jpeg:
+                try:
+                    self._decoded_q.put(self.decode_frame(frame, *self._target_size))
+                except Exception as e:
+                    # Not self.log(): the log widget belongs to the Tk thread
+                    print(f"Error decoding frame: {e}")
+    
+    def _schedule_frame_poll(self):
+        """Start collecting decoded frames, unless a poll is already pending"""
+        if self._frame_poll is None:
+            self._frame_poll = self.root.after(self.FRAME_POLL_MS, self._poll_frames)
+    
+    def _poll_frames(self):
+        """Show the newest decoded frame, dropping any older ones"""
+        self._frame_poll = None
+        image = None
+        try:
+            while True:
+                image = self._decoded_q.get_nowait()
+        except queue.Empty:
+            pass
         
-        # Schedule next check
-        self.root.after(33, self.check_for_frames)
+        # Polling stops with live view; start_live_view resumes it
+        if self.running:
+            if image is not None:
+                self.display_frame(image)
+            self._schedule_frame_poll()
     
-    def display_frame(self, frame):
-        """Display a frame on the canvas"""
+    @staticmethod
+    def _load_turbojpeg():
+        """Return a TurboJPEG decoder, or None if libjpeg-turbo isn't available"""
+        if TurboJPEG is None:
+            return None
         try:
-            if frame and frame.jpeg:
-                # Convert to image
-                image = Image.open(io.BytesIO(frame.jpeg))
-                
-                # Get canvas size
+            return TurboJPEG()
+        except (OSError, RuntimeError) as e:
+            print(f"turbojpeg unavailable, using PIL: {e}")
+            return None
+    
+    def _turbo_decode(self, jpeg, canvas_width, canvas_height):
+        """
+        Decode with libjpeg-turbo, scaled down during decoding by the largest
+        of 1/2, 1/4 or 1/8 that still covers the canvas (as Image.draft does)
+        """
+        width, height, _, _ = self._turbojpeg.decode_header(jpeg)
+        reduction = min(width // canvas_width, height // canvas_height)
+        denominator = next((d for d in (8, 4, 2) if d <= reduction), 1)
+        rgb = self._turbojpeg.decode(jpeg, pixel_format=TJPF_RGB, scaling_factor=(1, denominator))
+        return Image.fromarray(rgb)
+    
+    def decode_frame(self, frame, canvas_width, canvas_height):
+        """
+        Decode a live view frame and scale it to fit the canvas
+        
+        Args:
+            frame: JPEGandExtension from the live view receiver
+            canvas_width: Width to fit, in pixels
+            canvas_height: Height to fit, in pixels
+            
+        Returns:
+            The decoded PIL image
+        """
+        fits_canvas = canvas_width > 10 and canvas_height > 10
+        if fits_canvas and self._turbojpeg is not None and not self.high_quality:
+            image = self._turbo_decode(frame.jpeg, canvas_width, canvas_height)
+        else:
+            image = Image.open(io.BytesIO(frame.jpeg))
+        
+        if fits_canvas:
+            if not self.high_quality and image.format == 'JPEG':
+                # Let the JPEG decoder downscale by 1/2, 1/4 or 1/8 while
+                # decoding, as far as the result still covers the canvas
+                image.draft('RGB', (canvas_width, canvas_height))
+            
+            # Scale image to fit
+            img_width, img_height = image.size
+            scale = min(canvas_width / img_width, canvas_height / img_height)
+            
+            if scale < 1:
+                new_width = int(img_width * scale)
+                new_height = int(img_height * scale)
+                resample = Image.LANCZOS if self.high_quality else Image.BILINEAR
+                image = image.resize((new_width, new_height), resample)
+        
+        # Finish decoding here rather than on the Tk thread
+        image.load()
+        return image
+    
+    def display_frame(self, image):
+        """Display a decoded frame on the canvas"""
+        try:
+            if image is not None:
                 canvas_width = self.canvas.winfo_width()
                 canvas_height = self.canvas.winfo_height()
                 
-                if canvas_width > 10 and canvas_height > 10:
-                    # Scale image to fit
-                    img_width, img_height = image.size
-                    scale = min(canvas_width / img_width, canvas_height / img_height)
-                    
-                    if scale < 1:
-                        new_width = int(img_width * scale)
-                        new_height = int(img_height * scale)
-                        image = image.resize((new_width, new_height), Image.LANCZOS)
+                # Display: paste into the existing photo while the frame size
+                # stays the same, only allocating a new one when it changes
+                if self._photo is None or (self._photo.width(), self._photo.height()) != image.size:
+                    self._photo = ImageTk.PhotoImage(image)
+                    if self._canvas_item is None:
+                        self._canvas_item = self.canvas.create_image(
+                            canvas_width/2, canvas_height/2,
+                            image=self._photo,
+                            anchor=tk.CENTER
+                        )
+                    else:
+                        self.canvas.itemconfigure(self._canvas_item, image=self._photo)
+                else:
+                    self._photo.paste(image)
                 
-                # Display
-                self.photo = ImageTk.PhotoImage(image)
-                self.canvas.delete("all")
-                self.canvas.create_image(
-                    canvas_width/2, canvas_height/2,
-                    image=self.photo,
-                    anchor=tk.CENTER
-                )
+                # Keep the frame centred when the canvas is resized
+                if (canvas_width, canvas_height) != self._canvas_size:
+                    self.canvas.coords(self._canvas_item, canvas_width/2, canvas_height/2)
+                    self._canvas_size = (canvas_width, canvas_height)
         except Exception as e:
             self.log(f"Error displaying frame: {e}")
     
     def on_close(self):
         """Handle window close"""
+        self._decoding = False
+        self._frame_ready.set()
         try:
             if self.running:
                 self.receiver.shut_down()
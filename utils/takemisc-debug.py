@@ -6,20 +6,36 @@ import time
 import sys
 from olympuswifi.camera import OlympusCamera
 
+from _camsession import install_session, send_command_noresp
+
+# Property name fragments for the digital zoom and MF assist probes
+_ZOOM_KEYWORDS = ('digital', 'zoom')
+_MF_KEYWORDS = ('mf', 'assist')
+
+
+def _section(title):
+    """Print a section header and write out everything printed so far"""
+    print(f"\n--- {title} ---", flush=True)
+
+
 def main():
+    # Block-buffer output even on a terminal; _section() flushes once per phase
+    sys.stdout.reconfigure(line_buffering=False)
+    session = None
     try:
-        print("Connecting to camera...")
+        print("Connecting to camera...", flush=True)
+        session = install_session()
         camera = OlympusCamera()
         print(f"Connected to {camera.get_camera_model()}")
         
         # Print camera info
-        print("\n--- Camera Info ---")
+        _section("Camera Info")
         print(f"Model: {camera.get_camera_model()}")
         print(f"Supported: {camera.get_supported()}")
         print(f"Versions: {camera.get_versions()}")
         
         # Check exact takemisc command structure
-        print("\n--- exec_takemisc Command Details ---")
+        _section("exec_takemisc Command Details")
         takemisc_cmd = camera.commands.get('exec_takemisc')
         if takemisc_cmd:
             print(f"Method: {takemisc_cmd.method}")
@@ -37,17 +53,17 @@ def main():
                     print(f"move options: {takemisc_cmd.args['com']['ctrlzoom']['move']}")
         
         # Switch to recording mode
-        print("\n--- Switching to recording mode ---")
+        _section("Switching to recording mode")
         camera.send_command('switch_cammode', mode='rec')
         time.sleep(1)
         
         # Start live view
-        print("\n--- Starting live view ---")
+        _section("Starting live view")
         camera.start_liveview(port=40000, lvqty="0640x0480")
         time.sleep(1)
         
         # Test each available command in exec_takemisc
-        print("\n--- Testing each exec_takemisc variant ---")
+        _section("Testing each exec_takemisc variant")
         if takemisc_cmd and takemisc_cmd.args and 'com' in takemisc_cmd.args:
             for com_name in takemisc_cmd.args['com'].keys():
                 print(f"\nTesting com={com_name}")
@@ -61,21 +77,21 @@ def main():
                             try:
                                 # First try with point parameter
                                 print(f"    With point='0160x0120'...")
-                                response = camera.send_command('exec_takemisc', 
-                                                             com='ctrlzoom', 
+                                status = send_command_noresp(camera, 'exec_takemisc',
+                                                             com='ctrlzoom',
                                                              move=move,
                                                              point='0160x0120')
-                                print(f"    Response: {response.status_code}")
+                                print(f"    Response: {status}")
                             except Exception as e:
                                 print(f"    Error with point: {e}")
                                 
                             try:
                                 # Then try without point
                                 print(f"    Without point...")
-                                response = camera.send_command('exec_takemisc', 
-                                                             com='ctrlzoom', 
+                                status = send_command_noresp(camera, 'exec_takemisc',
+                                                             com='ctrlzoom',
                                                              move=move)
-                                print(f"    Response: {response.status_code}")
+                                print(f"    Response: {status}")
                             except Exception as e:
                                 print(f"    Error without point: {e}")
                     elif com_name == 'startliveview':
@@ -108,7 +124,7 @@ def main():
                     print(f"  General error: {e}")
         
         # Test alternative ways of magnifying
-        print("\n--- Testing focus magnification alternatives ---")
+        _section("Testing focus magnification alternatives")
         
         # Method 1: Double-tap focus point
         print("\nMethod 1: Double-tap focus point")
@@ -123,43 +139,47 @@ def main():
         except Exception as e:
             print(f"Error: {e}")
         
+        # Settable properties for methods 2 and 3, split up front
+        properties = camera.get_settable_propnames_and_values()
+        props_lc = [(name, name.lower(), values) for name, values in properties.items()]
+        zoom_props = [(name, values) for name, name_lc, values in props_lc
+                      if any(keyword in name_lc for keyword in _ZOOM_KEYWORDS)]
+        mf_props = [(name, values) for name, name_lc, values in props_lc
+                    if any(keyword in name_lc for keyword in _MF_KEYWORDS)]
+        
         # Method 2: Check for digital zoom
         print("\nMethod 2: Digital zoom controls")
         try:
-            properties = camera.get_settable_propnames_and_values()
-            for prop_name, values in properties.items():
-                if 'digital' in prop_name.lower() or 'zoom' in prop_name.lower():
-                    print(f"Found property: {prop_name} = {values}")
-                    current = camera.get_camprop(prop_name)
-                    print(f"Current value: {current}")
+            for prop_name, values in zoom_props:
+                print(f"Found property: {prop_name} = {values}")
+                current = camera.get_camprop(prop_name)
+                print(f"Current value: {current}")
         except Exception as e:
             print(f"Error: {e}")
         
         # Method 3: Try with manual focus assist
         print("\nMethod 3: Manual focus assist")
         try:
-            properties = camera.get_settable_propnames_and_values()
-            for prop_name, values in properties.items():
-                if 'mf' in prop_name.lower() or 'assist' in prop_name.lower():
-                    print(f"Found property: {prop_name} = {values}")
-                    current = camera.get_camprop(prop_name)
-                    print(f"Current value: {current}")
-                    
-                    # Try to toggle it
-                    for val in values:
-                        if val != current:
-                            print(f"Setting {prop_name} to {val}...")
-                            try:
-                                camera.set_camprop(prop_name, val)
-                                print("Success")
-                                time.sleep(2)
-                                
-                                # Reset to original
-                                camera.set_camprop(prop_name, current)
-                                print("Reset to original")
-                            except Exception as e:
-                                print(f"Error setting property: {e}")
-                            break
+            for prop_name, values in mf_props:
+                print(f"Found property: {prop_name} = {values}")
+                current = camera.get_camprop(prop_name)
+                print(f"Current value: {current}")
+                
+                # Try to toggle it
+                for val in values:
+                    if val != current:
+                        print(f"Setting {prop_name} to {val}...")
+                        try:
+                            camera.set_camprop(prop_name, val)
+                            print("Success")
+                            time.sleep(2)
+                            
+                            # Reset to original
+                            camera.set_camprop(prop_name, current)
+                            print("Reset to original")
+                        except Exception as e:
+                            print(f"Error setting property: {e}")
+                        break
         except Exception as e:
             print(f"Error: {e}")
         
@@ -172,6 +192,9 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        if session:
+            session.close()
 
 
 if __name__ == "__main__":